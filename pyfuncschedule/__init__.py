@@ -1,5 +1,62 @@
 from . import grammar
 from . import parser
+from . import cursor
+from . import precision
+from . import runner
+from . import async_runner
+from . import buffer
+from . import timeline
+from . import tracing
+from . import analysis
+from . import parallel
+from . import lazy
 from .parser import ScheduleParser, parse, resolve, Schedule
+from .cursor import ScheduleCursor
+from .precision import PrecisionRunner, TimingStats
+from .runner import ThreadedRunner, run
+from .async_runner import AsyncRunner
+from .timeline import Timeline, firing_times, iter_firing_times, firing_histogram
+from .timer import ScheduleHandle, RunnerStats, TokenBucket
+from .tracing import Tracer
+from .analysis import ScheduleStats, interval_bounds, check_budget
+from .parallel import parse_parallel
+from .lazy import LazySchedule, validate
 
-__all__ = ("grammar", "parser", "ScheduleParser", "Schedule", "parse", "resolve")
+__all__ = (
+    "grammar",
+    "parser",
+    "cursor",
+    "precision",
+    "runner",
+    "async_runner",
+    "buffer",
+    "timeline",
+    "tracing",
+    "analysis",
+    "parallel",
+    "lazy",
+    "ScheduleParser",
+    "Schedule",
+    "ScheduleCursor",
+    "PrecisionRunner",
+    "TimingStats",
+    "ThreadedRunner",
+    "AsyncRunner",
+    "ScheduleHandle",
+    "RunnerStats",
+    "TokenBucket",
+    "Timeline",
+    "Tracer",
+    "ScheduleStats",
+    "LazySchedule",
+    "parse",
+    "resolve",
+    "run",
+    "firing_times",
+    "iter_firing_times",
+    "firing_histogram",
+    "interval_bounds",
+    "check_budget",
+    "parse_parallel",
+    "validate",
+)
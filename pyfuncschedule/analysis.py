@@ -0,0 +1,142 @@
+import math
+from dataclasses import dataclass
+from typing import Callable, List, Any
+
+from .parser import VSchedule, VFuncCall
+
+__all__ = ("ScheduleStats", "interval_bounds", "analyse", "check_budget")
+
+INF = math.inf
+
+
+def interval_bounds(low: float, high: float = INF) -> Callable:
+    """Decorator declaring the range of values an interval function returns, used by `analyse`. Functions without bounds are assumed to return any value in `[0, inf)`.
+
+    Example:
+    ```
+        @interval_bounds(0, 1)
+        def uniform01():
+            return random.uniform(0, 1)
+        parser.register_function(uniform01)
+    ```
+    """
+    if low < 0 or high < low:
+        raise ValueError(f"Invalid interval bounds: [{low}, {high}]")
+
+    def decorator(func):
+        func.interval_bounds = (float(low), float(high))
+        return func
+
+    return decorator
+
+
+@dataclass(frozen=True)
+class ScheduleStats:
+    """dataclass holding load statistics of a schedule, computed from its interval/repeat tree without running it. Times are in seconds, `(low, high)` pairs bound values that depend on interval functions.
+
+    Attributes:
+        count (float): total number of firings, `inf` if the schedule repeats forever.
+        period (Tuple[float, float]): duration of one repeat of the outermost block.
+        period_count (float): number of firings in one period.
+        duration (Tuple[float, float]): total duration, `inf` if the schedule repeats forever.
+        min_interval (Tuple[float, float]): smallest interval.
+    """
+
+    count: float
+    period: tuple
+    period_count: float
+    duration: tuple
+    min_interval: tuple
+
+    @property
+    def finite(self) -> bool:
+        return self.count != INF
+
+    @property
+    def mean_rate(self) -> tuple:
+        """Average firings per second over a period."""
+        low, high = self.period
+        return (_div(self.period_count, high), _div(self.period_count, low))
+
+    @property
+    def peak_rate(self) -> float:
+        """Upper bound on the instantaneous firing rate (one over the smallest possible interval)."""
+        return _div(1, self.min_interval[0])
+
+
+def analyse(schedule) -> ScheduleStats:
+    """Computes `ScheduleStats` for a resolved schedule (also available as `schedule.stats`). This is O(size of the schedule), nested repeats are multiplied out rather than expanded.
+
+    Args:
+        schedule (Schedule): resolved schedule.
+
+    Returns:
+        ScheduleStats: statistics
+    """
+    count, low, high, min_low, min_high = _block(schedule._schedule)
+    repeat = _repeat(schedule._schedule)
+    return ScheduleStats(
+        count=_mul(count, repeat),
+        period=(low, high),
+        period_count=count,
+        duration=(_mul(low, repeat), _mul(high, repeat)),
+        min_interval=(min_low, min_high),
+    )
+
+
+def check_budget(schedules: List[Any], max_rate: float, peak: bool = True):
+    """Rejects a set of schedules whose combined firing rate could exceed `max_rate` firings per second.
+
+    Args:
+        schedules (List[Schedule]): resolved schedules.
+        max_rate (float): firings per second.
+        peak (bool, optional): use each schedule's `peak_rate`, otherwise the upper bound of its `mean_rate`. Defaults to True.
+
+    Raises:
+        ValueError: if the budget is exceeded.
+    """
+    rates = [s.stats.peak_rate if peak else s.stats.mean_rate[1] for s in schedules]
+    total = sum(rates)
+    if total > max_rate:
+        worst = sorted(range(len(rates)), key=rates.__getitem__, reverse=True)[:5]
+        worst = ", ".join(f"{schedules[i]} ({rates[i]:.4g}/s)" for i in worst)
+        raise ValueError(
+            f"Combined {'peak' if peak else 'mean'} rate {total:.4g}/s exceeds the budget of {max_rate:.4g}/s.\n"
+            f"Largest contributors: {worst}"
+        )
+
+
+def _block(schedule: VSchedule):
+    """`(count, low, high, min_low, min_high)` for one repeat of `schedule`."""
+    count, low, high, min_low, min_high = 0, 0.0, 0.0, INF, INF
+    for interval in schedule._intervals:
+        if isinstance(interval, VSchedule):
+            c, lo, hi, mlo, mhi = _block(interval)
+            repeat = _repeat(interval)
+            c, lo, hi = _mul(c, repeat), _mul(lo, repeat), _mul(hi, repeat)
+        else:
+            if isinstance(interval, VFuncCall):
+                lo, hi = getattr(interval._func, "interval_bounds", (0.0, INF))
+            else:
+                lo = hi = float(interval)
+            c, mlo, mhi = 1, lo, hi
+        count, low, high = count + c, low + lo, high + hi
+        min_low, min_high = min(min_low, mlo), min(min_high, mhi)
+    return count, low, high, min_low, min_high
+
+
+def _repeat(schedule: VSchedule) -> float:
+    repeat = schedule._repeat
+    return INF if repeat < 0 else repeat
+
+
+def _mul(x: float, repeat: float) -> float:
+    if repeat == INF:
+        return INF if x > 0 else 0.0
+    return x * repeat
+
+
+def _div(x: float, y: float) -> float:
+    if y == 0:
+        return INF if x > 0 else 0.0
+    return x / y
@@ -1,4 +1,5 @@
 import asyncio
+import inspect
 
 __all__ = ("_AsyncScheduleIterator",)
 
@@ -7,7 +8,7 @@ class _AsyncScheduleIterator:
 
     def __init__(self, schedule):
         super().__init__()
-        self._schedule = iter(schedule)
+        self._schedule = iter(schedule)._allow_async()
         self._done = False
 
     def __aiter__(self):
@@ -18,9 +19,15 @@ class _AsyncScheduleIterator:
     async def __anext__(self):
         try:
             wait_time, action = next(self._schedule)
+            if inspect.isawaitable(wait_time):  # async interval function
+                wait_time = float(await wait_time)
             await asyncio.sleep(wait_time)
             return action()  # call the action after waiting
         except StopIteration:
             self._done = True
             # pylint: disable = W0707
             raise StopAsyncIteration
+
+    def cursor(self):
+        """Captures the position of the underlying schedule iterator, see `VActionSchedule.resume`."""
+        return self._schedule.cursor()
@@ -0,0 +1,232 @@
+import asyncio
+import inspect
+import threading
+from typing import Callable, List, Any
+
+from .buffer import BLOCK, _ResultBuffer
+from .prefetch import _AsyncPrefetcher
+from .timer import _Runner
+from .tracing import Tracer
+
+__all__ = ("AsyncRunner",)
+
+
+class AsyncRunner(_Runner):
+    """Runs many schedules from a single `asyncio` timer task and merges the results of their actions into one async iterator. Unlike `parser.stream` the runner is long-lived: schedules can be added, cancelled, paused and resumed while it is running, from other tasks or other threads.
+
+    Async actions (those returning an awaitable) are run as tasks, their result is produced when they complete.
+
+    Actions are fired by the timer task whether or not the results are being consumed, results are kept in a buffer until they are. Give the buffer a size to bound memory use with a slow consumer, the `overflow` policy decides what happens when it is full: `"block"` delays firings until there is space, `"drop_oldest"` and `"drop_newest"` discard a result and `"sample"` replaces the newest buffered result with the new one (so the consumer sees the latest result). Dropped results are counted in `stats.dropped`.
+
+    Example:
+    ```
+        async with AsyncRunner(schedules, keep_alive=True) as runner:
+            handle = runner.add(schedule)
+            ...
+            runner.cancel(handle)
+            async for x in runner:
+                print(x)
+    ```
+    """
+
+    def __init__(
+        self,
+        schedules: List[Any] = (),
+        keep_alive: bool = False,
+        error_callback: Callable = None,
+        prefetch: int = 0,
+        tracer: Tracer = None,
+        spread: bool = False,
+        rate_limit: float = None,
+        burst: int = 1,
+        buffer_size: int = 0,
+        overflow: str = BLOCK,
+    ):
+        """
+        Args:
+            schedules (List[Schedule], optional): schedules to run. Defaults to ().
+            keep_alive (bool, optional): keep running when there are no schedules left (until `close`), otherwise iteration stops once all schedules are exhausted or cancelled. Defaults to False.
+            error_callback (Callable, optional): called with the exception raised by an action or interval function. Defaults to None.
+            prefetch (int, optional): evaluate up to this many intervals of each schedule ahead of time, in the default executor (or as tasks for async interval functions), so that slow interval functions do not delay firings. Async interval functions require prefetch. NOTE: interval functions are then called before the preceding actions are taken. Defaults to 0.
+            tracer (Tracer, optional): record the scheduled time, start and end of each action (async actions end when their task completes). Defaults to None.
+            spread (bool, optional): spread the first firing of each schedule across its first interval (by a deterministic hash of its key) so that schedules added together do not all fire in phase. Defaults to False.
+            rate_limit (float, optional): maximum firings per second across all schedules (a token bucket), firings over the limit are delayed without changing the timing of later firings. Defaults to None.
+            burst (int, optional): number of firings allowed at once under `rate_limit`. Defaults to 1.
+            buffer_size (int, optional): maximum number of results waiting to be consumed, 0 for no limit. Defaults to 0.
+            overflow (str, optional): what to do with a result when the buffer is full, one of `"block"`, `"drop_oldest"`, `"drop_newest"` or `"sample"`. Defaults to `"block"`.
+        """
+        super().__init__(prefetch, spread, rate_limit, burst)
+        self._tracer = tracer
+        self._lock = threading.Lock()
+        self._keep_alive = keep_alive
+        self._error_callback = error_callback
+        self._results = _ResultBuffer(buffer_size, overflow)
+        self._loop = None
+        self._loop_thread = None
+        self._task = None
+        self._waiter = None
+        self._closed = False
+        self._tasks = set()  # running async actions
+        self._deferred = []  # calls made before the runner started
+        for schedule in schedules:
+            self.add(schedule)
+
+    def start(self):
+        """Starts the timer task, must be called from a running event loop. This is done automatically by `async with` and `async for`."""
+        if self._task is not None:
+            raise ValueError("Runner already started.")
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._task = self._loop.create_task(self._run())
+        for func, args in self._deferred:
+            self._loop.call_soon(func, *args)
+        self._deferred.clear()
+        return self
+
+    def close(self):
+        """Stops the runner, no further actions will be taken. Iteration ends once the results already produced have been consumed."""
+        with self._lock:
+            self._closed = True
+            self._notify()
+
+    async def __aenter__(self):
+        if self._task is None:
+            self.start()
+        return self
+
+    async def __aexit__(self, *_):
+        self.close()
+        for task in list(self._tasks):
+            task.cancel()
+        await self._task
+
+    def __aiter__(self):
+        if self._task is None:
+            self.start()
+        return self
+
+    async def __anext__(self):
+        return await self._results.get()
+
+    def _notify(self):
+        if self._loop is None:
+            return
+        if threading.get_ident() == self._loop_thread:
+            self._wake()
+        else:
+            self._loop.call_soon_threadsafe(self._wake)
+
+    def _defer(self, func, *args):
+        if self._loop is None:
+            self._deferred.append((func, args))
+        else:
+            self._loop.call_soon_threadsafe(func, *args)
+
+    def _make_prefetcher(self, iterator):
+        return _AsyncPrefetcher(iterator, self._prefetch, self._loop)
+
+    def _wake(self):
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+        self._results.wake_putter()
+
+    async def _run(self):
+        loop, queue = self._loop, self._queue
+        try:
+            while True:
+                with self._lock:
+                    if self._closed:
+                        break
+                    deadline = queue.peek()
+                    now = self._clock()
+                    if deadline is None and not (
+                        self._keep_alive or self._paused or self._waiting
+                    ):
+                        break
+                    if deadline is None or deadline > now:
+                        self._waiter = loop.create_future()
+                    else:
+                        handle = queue.pop()
+                        if self._throttle(handle, now):
+                            continue
+                        action, scheduled = handle._action, handle._deadline
+                        self._next(handle, handle._deadline)
+                if self._waiter is None:
+                    if self._results.blocking:
+                        now = await self._wait_for_space(now)
+                        if now is None:
+                            break
+                    self._fire(action, scheduled, now)
+                    # let the consumer and other tasks run between due firings (e.g. `[0]:*` or a large burst)
+                    await asyncio.sleep(0)
+                    continue
+                timer = None
+                if deadline is not None:
+                    timer = loop.call_later(deadline - now, self._wake)
+                await self._waiter
+                self._waiter = None
+                if timer is not None:
+                    timer.cancel()
+            if self._tasks and not self._closed:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+        finally:
+            self._results.end()
+
+    async def _wait_for_space(self, now: float):
+        """Blocks until the result buffer has room for another result (counting running async actions), returns the time afterwards or None if the runner was closed."""
+        results = self._results
+        while results.full(len(self._tasks)):
+            await results.wait_for_space()
+            if self._closed:
+                return None
+            now = self._clock()
+        return now
+
+    def _fire(self, action: Callable, scheduled: float, now: float):
+        self.stats._record_fire(now - scheduled, now)
+        tracer = self._tracer
+        start = now if tracer is None else tracer.clock()
+        try:
+            result = action()
+        except Exception as error:  # pylint: disable = W0718
+            if tracer is not None:
+                tracer.record(Tracer.FIRING, action, scheduled, start, tracer.clock())
+            self._error(error)
+            return
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            self._tasks.add(task)
+            task.add_done_callback(self._done)
+            if tracer is not None:
+                task.add_done_callback(
+                    lambda _: tracer.record(
+                        Tracer.FIRING, action, scheduled, start, tracer.clock()
+                    )
+                )
+            return
+        if tracer is not None:
+            tracer.record(Tracer.FIRING, action, scheduled, start, tracer.clock())
+        self.stats.completed += 1
+        self._put(result)
+
+    def _done(self, task):
+        self._tasks.discard(task)
+        self._results.wake_putter()
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self._error(error)
+        else:
+            self.stats.completed += 1
+            self._put(task.result())
+
+    def _put(self, result):
+        if self._results.put(result):
+            self.stats.dropped += 1
+
+    def _error(self, error: Exception):
+        self.stats.errors += 1
+        if self._error_callback is not None:
+            self._error_callback(error)
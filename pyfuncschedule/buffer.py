@@ -0,0 +1,99 @@
+import asyncio
+from collections import deque
+
+__all__ = ("BLOCK", "DROP_OLDEST", "DROP_NEWEST", "SAMPLE")
+
+BLOCK = "block"  # firings wait until there is space
+DROP_OLDEST = "drop_oldest"  # the oldest buffered result is discarded
+DROP_NEWEST = "drop_newest"  # the new result is discarded
+SAMPLE = "sample"  # the new result replaces the newest buffered result
+
+_OVERFLOW = (BLOCK, DROP_OLDEST, DROP_NEWEST, SAMPLE)
+
+
+class _ResultBuffer:
+    """Buffer between a runner's timer task and its consumer, holding at most `maxsize` results (unbounded if 0). Only used from the event loop thread."""
+
+    def __init__(self, maxsize: int = 0, overflow: str = BLOCK):
+        if overflow not in _OVERFLOW:
+            raise ValueError(
+                f"Invalid overflow policy: {overflow}, must be one of {_OVERFLOW}"
+            )
+        if maxsize < 0:
+            raise ValueError(f"Invalid buffer size: {maxsize}")
+        self._items = deque()
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._getters = deque()  # consumers waiting for a result
+        self._putter = None
+        self._ended = False
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def blocking(self) -> bool:
+        return self._maxsize > 0 and self._overflow == BLOCK
+
+    def full(self, reserved: int = 0) -> bool:
+        return self._maxsize > 0 and len(self._items) + reserved >= self._maxsize
+
+    def put(self, item) -> bool:
+        """Adds a result without waiting, applying the overflow policy if the buffer is full. With `BLOCK` the producer is expected to wait for space first.
+
+        Returns:
+            bool: whether a result was dropped.
+        """
+        dropped = self.full() and self._overflow != BLOCK
+        if dropped:
+            if self._overflow == DROP_NEWEST:
+                return True
+            elif self._overflow == DROP_OLDEST:
+                self._items.popleft()
+            else:  # SAMPLE
+                self._items.pop()
+        self._items.append(item)
+        self._wake_getter()
+        return dropped
+
+    def end(self):
+        """No more results will be produced, `get` raises `StopAsyncIteration` once the buffer is empty."""
+        self._ended = True
+        while self._getters:
+            self._wake_getter()
+
+    async def get(self):
+        while not self._items:
+            if self._ended:
+                raise StopAsyncIteration
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except asyncio.CancelledError:
+                # pass the wake-up on if this getter was woken for a result
+                if getter in self._getters:
+                    self._getters.remove(getter)
+                elif self._items:
+                    self._wake_getter()
+                raise
+        item = self._items.popleft()
+        self.wake_putter()
+        return item
+
+    async def wait_for_space(self):
+        """Waits until a result is consumed or `wake_putter` is called, the caller re-checks `full`."""
+        self._putter = asyncio.get_running_loop().create_future()
+        await self._putter
+        self._putter = None
+
+    def wake_putter(self):
+        if self._putter is not None and not self._putter.done():
+            self._putter.set_result(None)
+
+    def _wake_getter(self):
+        while self._getters:
+            getter = self._getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                return
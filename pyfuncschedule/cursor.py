@@ -0,0 +1,83 @@
+import json
+from dataclasses import dataclass, field
+from typing import Tuple, Any
+
+__all__ = ("ScheduleCursor", "save", "load")
+
+
+@dataclass(frozen=True)
+class ScheduleCursor:
+    """dataclass representing the position of a schedule iterator. Can be used to resume iteration exactly where it left off.
+
+    Attributes:
+        stack (Tuple[Tuple[int, int], ...]): `(repeat, index)` for each nesting level, outermost first. Empty if the schedule is exhausted.
+        elapsed (float): total schedule time (sum of the intervals produced so far).
+        count (int): number of intervals produced so far.
+    """
+
+    stack: Tuple[Tuple[int, int], ...] = field(default=((0, 0),))
+    elapsed: float = 0.0
+    count: int = 0
+
+    @property
+    def done(self) -> bool:
+        return len(self.stack) == 0
+
+    def to_dict(self):
+        return {
+            "stack": [list(level) for level in self.stack],
+            "elapsed": self.elapsed,
+            "count": self.count,
+        }
+
+    @staticmethod
+    def from_dict(data):
+        return ScheduleCursor(
+            tuple((int(r), int(i)) for r, i in data["stack"]),
+            float(data["elapsed"]),
+            int(data["count"]),
+        )
+
+
+def save(path: str, state: Any):
+    """Writes a snapshot of runner state to `path` as JSON.
+
+    Args:
+        path (str): file to write.
+        state (Any): a `ScheduleCursor`, or any `list`/`dict` structure containing them.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(_encode(state), f)
+
+
+def load(path: str) -> Any:
+    """Reads a snapshot written by `save`, `ScheduleCursor`s are restored in place.
+
+    Args:
+        path (str): file to read.
+
+    Returns:
+        Any: the saved state.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return _decode(json.load(f))
+
+
+def _encode(state):
+    if isinstance(state, ScheduleCursor):
+        return {"__cursor__": state.to_dict()}
+    elif isinstance(state, (list, tuple)):
+        return [_encode(x) for x in state]
+    elif isinstance(state, dict):
+        return {k: _encode(v) for k, v in state.items()}
+    return state
+
+
+def _decode(state):
+    if isinstance(state, dict):
+        if "__cursor__" in state:
+            return ScheduleCursor.from_dict(state["__cursor__"])
+        return {k: _decode(v) for k, v in state.items()}
+    elif isinstance(state, list):
+        return [_decode(x) for x in state]
+    return state
@@ -0,0 +1,238 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Tuple, Union
+
+from .cursor import ScheduleCursor
+from .grammar import FuncCall as GFuncCall, Schedule as GSchedule
+from .parser import VActionSchedule, resolve_action_schedule
+
+__all__ = ("LazySchedule", "validate")
+
+
+class LazySchedule:
+    """Handle to a schedule that is resolved on first use, returned by `resolve(..., lazy=True)`. Until then it holds only the parse tree, the action name and the first interval (if it is a number), so resolving many schedules is cheap and a runner can start firing them straight away: the first firing resolves the schedule before taking its action.
+
+    Resolution errors (unregistered functions, wrong arguments) are raised on first use, e.g. reported (once) to a runner's `error_callback` when the schedule first fires, after which the schedule ends. Use `validate` to check all schedules up front.
+
+    Anything other than iterating (`stats`, `resume`, `stream`, ...) resolves the schedule and delegates to the resolved `Schedule`.
+    """
+
+    def __init__(
+        self,
+        action: GFuncCall,
+        schedule: GSchedule,
+        actions: Dict[str, Any],
+        functions: Dict[str, Any],
+    ):
+        self.name = action.identifier
+        # nesting depth of the first interval, gives the cursor after it without resolving
+        self.first_interval, self._first_depth = _first_interval(schedule)
+        self._parsed = (action, schedule)
+        self._actions = actions
+        self._functions = functions
+        self._resolved = None
+        self._error = None  # raised by every use once resolving has failed
+        self._lazy_action = None
+
+    @property
+    def resolved(self) -> bool:
+        return self._resolved is not None
+
+    def resolve(self) -> VActionSchedule:
+        """Resolves the schedule (once), the parse tree is released afterwards.
+
+        Raises:
+            ValueError: if an action or function is not registered or is called with invalid arguments.
+        """
+        if self._error is not None:
+            raise self._error
+        parsed = self._parsed  # None once resolved
+        if parsed is not None:
+            # resolving is idempotent, a concurrent resolve only wastes some work
+            try:
+                resolved = resolve_action_schedule(
+                    *parsed, self._actions, self._functions
+                )
+            except ValueError as error:
+                self._error = error
+                raise
+            if self._resolved is None:
+                self._resolved = resolved
+            self._parsed = None
+        return self._resolved
+
+    @property
+    def _action(self):
+        if self._resolved is not None:
+            return self._resolved._action
+        if self._lazy_action is None:
+            self._lazy_action = _LazyAction(self)
+        return self._lazy_action
+
+    @property
+    def _schedule(self):
+        return self.resolve()._schedule
+
+    @property
+    def stats(self):
+        return self.resolve().stats
+
+    def __iter__(self):
+        return _LazyScheduleIterator(self)
+
+    def resume(self, cursor: ScheduleCursor):
+        return self.resolve().resume(cursor)
+
+    def stream(self, cursor: ScheduleCursor = None, precise: bool = False):
+        return self.resolve().stream(cursor, precise)
+
+    def __str__(self):
+        if self._resolved is not None:
+            return str(self._resolved)
+        return f"{self.name}(...)@[{self.first_interval}, ...]"
+
+    def __repr__(self):
+        return str(self)
+
+
+class _LazyAction:
+    """Action of an unresolved `LazySchedule`, resolves it when called."""
+
+    def __init__(self, schedule: LazySchedule):
+        self._schedule = schedule
+
+    def __call__(self):
+        return self._schedule.resolve()._action()
+
+    def __str__(self):
+        schedule = self._schedule
+        if schedule.resolved:
+            return str(schedule._resolved._action)
+        return f"{schedule.name}(...)"
+
+    def __repr__(self):
+        return str(self)
+
+
+class _LazyScheduleIterator:
+    """Produces the first `(interval, action)` of a `LazySchedule` without resolving it (if the first interval is a number), then continues with the resolved schedule.
+
+    If the schedule does not resolve after its first action was produced, the iteration ends instead of raising: the action raises the error when it is taken, so it is reported once.
+    """
+
+    def __init__(self, schedule: LazySchedule):
+        self._schedule = schedule
+        self._iterator = None
+        self._skip = 0  # intervals produced before resolving
+        self._async = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._iterator is None:
+            schedule = self._schedule
+            if self._skip == 0 and not schedule.resolved:
+                if schedule.first_interval is not None:
+                    self._skip = 1
+                    return schedule.first_interval, schedule._action
+            return next(self._resolve())
+        return next(self._iterator)
+
+    def _resolve(self):
+        if self._iterator is None:
+            try:
+                resolved = self._schedule.resolve()
+            except ValueError:
+                if self._skip:
+                    raise StopIteration  # pylint: disable = W0707
+                raise
+            self._iterator = iter(resolved)
+            if self._async:
+                self._iterator._allow_async()
+            # the first interval is a number, skipping it has no side effects
+            for _ in range(self._skip):
+                next(self._iterator)
+        return self._iterator
+
+    def _allow_async(self):
+        self._async = True
+        if self._iterator is not None:
+            self._iterator._allow_async()
+        return self
+
+    def cursor(self) -> ScheduleCursor:
+        if self._iterator is None:
+            if self._skip == 0:
+                return ScheduleCursor()
+            # the first interval was produced without resolving, so neither is the cursor
+            schedule = self._schedule
+            return ScheduleCursor(
+                ((0, 0),) * (schedule._first_depth - 1) + ((0, 1),),
+                schedule.first_interval,
+                1,
+            )
+        return self._iterator.cursor()
+
+
+def validate(
+    schedules: List[LazySchedule], background: bool = False
+) -> Union[List[Tuple[LazySchedule, Exception]], Future]:
+    """Checks that lazy schedules resolve, without keeping the resolved schedules (so the memory saved by resolving lazily is kept).
+
+    Example:
+    ```
+        schedules = parser.resolve(parse_result, lazy=True)
+        errors = validate(schedules, background=True)
+        async with parser.runner(schedules) as runner:
+            ...
+            for schedule, error in errors.result():
+                print(schedule, error)
+    ```
+
+    Args:
+        schedules (List[LazySchedule]): schedules to check.
+        background (bool, optional): check in a background (daemon) thread. Defaults to False.
+
+    Returns:
+        List[Tuple[LazySchedule, Exception]]: the schedules that failed to resolve and their error, or a `Future` of this list if `background` is set.
+    """
+    if not background:
+        return _validate(schedules)
+    future = Future()
+    future.set_running_or_notify_cancel()
+
+    def target():
+        try:
+            future.set_result(_validate(schedules))
+        except BaseException as error:  # pylint: disable = W0718
+            future.set_exception(error)
+
+    threading.Thread(target=target, daemon=True).start()
+    return future
+
+
+def _validate(schedules: List[LazySchedule]) -> List[Tuple[LazySchedule, Exception]]:
+    errors = []
+    for schedule in list(schedules):
+        parsed = schedule._parsed
+        if parsed is None:  # already resolved
+            continue
+        try:
+            resolve_action_schedule(*parsed, schedule._actions, schedule._functions)
+        except ValueError as error:
+            errors.append((schedule, error))
+    return errors
+
+
+def _first_interval(schedule: GSchedule) -> Tuple[float, int]:
+    """The first interval of a parsed schedule if it is a number (otherwise None) and its nesting depth."""
+    depth = 0
+    while isinstance(schedule, GSchedule):
+        if not schedule.schedule:
+            return None, depth
+        schedule = schedule.schedule[0]
+        depth += 1
+    if isinstance(schedule, (int, float)) and not isinstance(schedule, bool):
+        return float(schedule), depth
+    return None, depth
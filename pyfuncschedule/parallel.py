@@ -0,0 +1,117 @@
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List
+
+from pyparsing import ParseBaseException
+
+from .grammar import action_with_schedule
+
+__all__ = ("parse_parallel", "split_statements")
+
+# tokens for finding statement boundaries: strings, comments, brackets, newlines and runs of other code. Strings and comments are matched whole so that brackets, `#` and newlines inside them are skipped
+_TOKEN = re.compile(r'"(?:[^"\n\r\\]|""|\\.)*"|#[^\n]*|[\[\]{}()]|\n|[^\s"#\[\]{}()]+')
+_SKIP = re.compile(r"(?:\s|#[^\n]*)*")
+_OPEN, _CLOSE = "[{(", "]})"
+
+_parser = None  # per process
+
+
+def split_statements(schedule: str, size: int) -> List[int]:
+    """Offsets at which `schedule` can be split into chunks of roughly `size` characters that each parse on their own. A chunk ends at a newline that is outside of any brackets, strings and comments, directly after the end of a statement (`]` or a repeat) and before the start of the next one (an action name).
+
+    Args:
+        schedule (str): schedule source.
+        size (int): minimum size of each chunk (except the last).
+
+    Returns:
+        List[int]: start offset of each chunk, the first is always 0.
+    """
+    offsets = [0]
+    depth = 0
+    last = -1  # position of the last character outside of comments and whitespace
+    cut = size
+    for match in _TOKEN.finditer(schedule):
+        c = schedule[match.start()]
+        if c == "#":
+            continue
+        if c != "\n":
+            if c in _OPEN:
+                depth += 1
+            elif c in _CLOSE:
+                depth -= 1
+            last = match.end() - 1
+        elif (
+            depth == 0
+            and match.start() >= cut
+            and last >= offsets[-1]  # the chunk contains a statement
+            and _is_boundary(schedule, last, match.end())
+        ):
+            offsets.append(match.end())
+            cut = match.end() + size
+    return offsets
+
+
+def _is_boundary(schedule: str, last: int, start: int) -> bool:
+    """Whether a statement ends at `last` and the next one starts after `start` (skipping whitespace and comments)."""
+    if not (schedule[last] in "]*" or schedule[last].isdigit()):
+        return False
+    j = _SKIP.match(schedule, start).end()
+    return j < len(schedule) and schedule[j].isalpha()
+
+
+def parse_parallel(
+    schedule: str,
+    processes: int = None,
+    min_chunk_size: int = 65536,
+    executor: Executor = None,
+) -> list:
+    """Parses a large schedule source in parallel. The source is split at statement boundaries (see `split_statements`), the chunks are parsed in a process pool and the results are concatenated in order, so the result is the same as `parse`. Sources smaller than two chunks are parsed in the calling process.
+
+    Parse errors are raised as by `parse`, with locations (and so line numbers) relative to the whole source.
+
+    Example:
+    ```
+        with open("schedules.txt") as f:
+            schedules = parser.resolve(parse_parallel(f.read()))
+    ```
+
+    Args:
+        schedule (str): schedule to parse.
+        processes (int, optional): number of worker processes. Defaults to `os.cpu_count()`.
+        min_chunk_size (int, optional): minimum number of characters parsed by each worker task. Defaults to 65536.
+        executor (Executor, optional): process pool to use instead of creating one. Defaults to None.
+
+    Returns:
+        list: parse result
+    """
+    processes = processes or os.cpu_count() or 1
+    # a few chunks per process so that uneven chunks balance out
+    size = max(min_chunk_size, len(schedule) // (4 * processes) + 1)
+    offsets = split_statements(schedule, size)
+    chunks = [schedule[start:end] for start, end in zip(offsets, offsets[1:] + [None])]
+    if len(chunks) == 1 or (processes == 1 and executor is None):
+        results = map(_parse_chunk, chunks)
+    elif executor is None:
+        with ProcessPoolExecutor(min(processes, len(chunks))) as pool:
+            results = list(pool.map(_parse_chunk, chunks))
+    else:
+        results = executor.map(_parse_chunk, chunks)
+    parse_result = []
+    for offset, (result, error) in zip(offsets, results):
+        if error is not None:
+            error_type, loc, msg = error
+            raise error_type(schedule, offset + loc, msg)
+        parse_result.extend(result)
+    return parse_result
+
+
+def _parse_chunk(chunk: str):
+    """Parses one chunk, returns `(result, None)` or `(None, (type, loc, msg))` as pyparsing exceptions refer to the chunk rather than the whole source."""
+    global _parser  # pylint: disable = W0603
+    if _parser is None:
+        _parser = action_with_schedule()
+    try:
+        return _parser.parseString(chunk, parse_all=True)[0].as_list(), None
+    except ParseBaseException as error:
+        return None, (type(error), error.loc, error.msg)
@@ -1,14 +1,22 @@
 import aiostream
 import inspect
+import math
 from typing import Callable, List, Any
 from .grammar import action_with_schedule, FuncCall as GFuncCall, Schedule as GSchedule
 from .async_iter import _AsyncScheduleIterator
+from .async_runner import AsyncRunner
+from .cursor import ScheduleCursor
+from .parallel import parse_parallel
+from .precision import _PrecisionScheduleIterator
+from .tracing import Tracer
 
 __all__ = ("ScheduleParser", "parse", "resolve", "Schedule")
 
 
 class VFuncCall:
 
+    _tracer = None  # see `Tracer.install`
+
     def __init__(self, name: str, arguments: List[Any], func: Callable):
         self._func = func
         self._name = name
@@ -30,8 +38,14 @@ class VFuncCall:
         assert False  # this should never happen...
 
     def __call__(self):
-        # print("RESOLVE!")
-        return self._func(*self._resolve(self._arguments))
+        tracer = VFuncCall._tracer
+        if tracer is None:
+            return self._func(*self._resolve(self._arguments))
+        start = tracer.clock()
+        try:
+            return self._func(*self._resolve(self._arguments))
+        finally:
+            tracer.record(Tracer.CALL, self, math.nan, start, tracer.clock())
 
     def __str__(self):
         return f"{self._name}({','.join(str(arg) for arg in self._arguments)})"
@@ -40,21 +54,12 @@ class VFuncCall:
         return str(self)
 
 
-def forever_iter():
-    while True:
-        yield None
-
-
 class VSchedule:
 
     def __init__(self, intervals, repeat):
         self._intervals = intervals
         self._repeat = repeat
         assert self._repeat != 0  # TODO check this in the parser early...
-        if self._repeat >= 0:
-            self._repeat_iter = range(self._repeat)
-        else:
-            self._repeat_iter = forever_iter()
 
     def __str__(self):
         return f"[{','.join(str(arg) for arg in self._intervals)}]:{self._repeat}"
@@ -63,14 +68,97 @@ class VSchedule:
         return str(self)
 
     def __iter__(self):
-        for _ in self._repeat_iter:
-            for interval in self._intervals:
-                if isinstance(interval, VSchedule):
-                    yield from interval
-                elif isinstance(interval, VFuncCall):
-                    yield float(interval())
-                else:
-                    yield float(interval)
+        return _ScheduleIterator(self)
+
+
+class _ScheduleIterator:
+    """Iterates the intervals of a `VSchedule`. The position is held explicitly as a `[schedule, repeat, index]` frame per nesting level (rather than in nested generators) so that it can be captured as a `ScheduleCursor` and restored in O(depth)."""
+
+    def __init__(self, schedule: VSchedule, cursor: ScheduleCursor = None):
+        cursor = ScheduleCursor() if cursor is None else cursor
+        self._async = False  # see `_allow_async`
+        self._elapsed = cursor.elapsed
+        self._count = cursor.count
+        self._stack = []
+        for repeat, index in cursor.stack:
+            if self._stack:
+                parent, _, parent_index = self._stack[-1]
+                schedule = parent._intervals[parent_index]
+            if not isinstance(schedule, VSchedule) or index > len(schedule._intervals):
+                raise ValueError(f"Cursor {cursor} does not match schedule.")
+            self._stack.append([schedule, repeat, index])
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        stack = self._stack
+        while stack:
+            frame = stack[-1]
+            schedule, repeat, index = frame
+            if index == len(schedule._intervals):
+                frame[1], frame[2] = repeat + 1, 0
+                if 0 <= schedule._repeat <= frame[1]:
+                    stack.pop()
+                    if stack:
+                        stack[-1][2] += 1
+                continue
+            interval = schedule._intervals[index]
+            if isinstance(interval, VSchedule):
+                stack.append([interval, 0, 0])
+                continue
+            if isinstance(interval, VFuncCall):
+                interval = interval()
+                if inspect.isawaitable(interval):
+                    if not self._async:
+                        if inspect.iscoroutine(interval):
+                            interval.close()
+                        raise TypeError(
+                            "Async interval functions are only supported by `stream` and by `AsyncRunner` with prefetch."
+                        )
+                    # the caller awaits it (not included in `elapsed`)
+                    frame[2] = index + 1
+                    self._count += 1
+                    return interval
+            interval = float(interval)
+            frame[2] = index + 1
+            self._elapsed += interval
+            self._count += 1
+            return interval
+        raise StopIteration
+
+    def _allow_async(self):
+        """Opts in to producing the awaitables returned by async interval functions (rather than raising `TypeError`), for callers that await them."""
+        self._async = True
+        return self
+
+    def cursor(self) -> ScheduleCursor:
+        """Captures the current position, the next interval produced after resuming from the cursor is the next interval this iterator would produce."""
+        return ScheduleCursor(
+            tuple((repeat, index) for _, repeat, index in self._stack),
+            self._elapsed,
+            self._count,
+        )
+
+
+class _ActionScheduleIterator:
+
+    def __init__(self, schedule: "VActionSchedule", cursor: ScheduleCursor = None):
+        self._action = schedule._action
+        self._intervals = _ScheduleIterator(schedule._schedule, cursor)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return (next(self._intervals), self._action)
+
+    def _allow_async(self):
+        self._intervals._allow_async()
+        return self
+
+    def cursor(self) -> ScheduleCursor:
+        return self._intervals.cursor()
 
 
 class VActionSchedule:
@@ -78,18 +166,46 @@ class VActionSchedule:
     def __init__(self, action: VFuncCall, schedule: VSchedule):
         self._action = action
         self._schedule = schedule
+        self._stats = None
+
+    @property
+    def stats(self) -> "ScheduleStats":
+        """Load statistics of this schedule (firing count, period, minimum interval, rates), see `analysis.analyse`."""
+        if self._stats is None:
+            from .analysis import analyse  # pylint: disable = C0415
+
+            self._stats = analyse(self)
+        return self._stats
 
     def __iter__(self):
-        _iter = iter(self._schedule)
-        for interval in _iter:
-            yield (interval, self._action)
+        return _ActionScheduleIterator(self)
+
+    def resume(self, cursor: ScheduleCursor):
+        """Returns an iterator over `(interval, action)` that continues from the given cursor.
+
+        Example:
+        ```
+            it = iter(schedule)
+            next(it)
+            cursor = it.cursor() # save this
+            ...
+            it = schedule.resume(cursor)
+        ```
+
+        Args:
+            cursor (ScheduleCursor): position captured from a previous iterator over this schedule.
+
+        Returns:
+            `_ActionScheduleIterator`: iterator
+        """
+        return _ActionScheduleIterator(self, cursor)
 
     def __aiter__(self):
         raise NotImplementedError(
             "TODO this should function similarly to __iter__ except await before returning each (interval,action)"
         )
 
-    def stream(self):
+    def stream(self, cursor: ScheduleCursor = None, precise: bool = False):
         """Returns an asynchronous iterator that will await each interval before calling the action associated with this schedule.
 
         Example:
@@ -98,10 +214,17 @@ class VActionSchedule:
                 print(x) # the result of taking each action
         ```
 
+        Args:
+            cursor (ScheduleCursor, optional): resume from this position. Defaults to None.
+            precise (bool, optional): use sleep-then-spin timing against absolute deadlines, for sub-millisecond intervals. Timing statistics are available as `stats` on the returned iterator. NOTE: spinning keeps the event loop busy (other tasks still run), see `PrecisionRunner` for a threaded alternative. Defaults to False.
+
         Returns:
             `_AsyncScheduleIterator`: async iterator
         """
-        return _AsyncScheduleIterator(self)
+        iterator = _ActionScheduleIterator(self, cursor)
+        if precise:
+            return _PrecisionScheduleIterator(iterator)
+        return _AsyncScheduleIterator(iterator)
 
     def __str__(self):
         return f"{self._action}@{self._schedule}"
@@ -140,11 +263,12 @@ class ScheduleParser:
             raise ValueError(f"A function with {name} is already registered.")
         self._allowed_functions[name] = func
 
-    def parse(self, schedule: str):
+    def parse(self, schedule: str, processes: int = None):
         """Parses the given schedule.
 
         Args:
             schedule (str): schedule to parse.
+            processes (int, optional): parse large schedules in this many worker processes, see `parallel.parse_parallel`. Defaults to None (parse in the calling process).
 
         Returns:
             list: parse result
@@ -157,13 +281,19 @@ class ScheduleParser:
             schedules = parser.resolve(parser.parse(schedule_str))
         ```
         """
+        if processes is not None:
+            return parse_parallel(schedule, processes=processes)
         return parse(schedule, parser=self._parser)
 
-    def resolve(self, parse_result) -> List["Schedule"]:
+    def resolve(
+        self, parse_result, max_rate: float = None, lazy: bool = False
+    ) -> List["Schedule"]:
         """Resolves callables in the given collection of schedules.
 
         Args:
             parse_result (str): schedule to parse.
+            max_rate (float, optional): reject the schedules (`ValueError`) if their combined peak firing rate could exceed this many firings per second, see `analysis.check_budget`. NOTE: this resolves lazy schedules. Defaults to None.
+            lazy (bool, optional): return `lazy.LazySchedule` handles that are resolved on first use (or first firing), invalid schedules are then only reported when used, see `lazy.validate`. Defaults to False.
 
         Returns:
             List[Schedule] : resolved schedules
@@ -176,7 +306,13 @@ class ScheduleParser:
             schedules = parser.resolve(parser.parse(schedule_str))
         ```
         """
-        return resolve(parse_result, self._allowed_actions, self._allowed_functions)
+        return resolve(
+            parse_result,
+            self._allowed_actions,
+            self._allowed_functions,
+            max_rate=max_rate,
+            lazy=lazy,
+        )
 
     def stream(self, schedules: List["Schedule"]) -> aiostream.core.Streamer:
         """Creates an `aiostream` stream that combines all provided schedules into one, the stream can be asynchronously iterated over.
@@ -197,6 +333,27 @@ class ScheduleParser:
         """
         return stream(schedules)
 
+    def runner(self, schedules: List["Schedule"], **kwargs) -> AsyncRunner:
+        """Creates an `AsyncRunner` that combines all provided schedules into one async iterator. Unlike `stream`, schedules can be added, cancelled, paused and resumed while it is running.
+
+        Args:
+            schedules (List[Schedule]): schedules to combine.
+            kwargs: see `AsyncRunner`.
+
+        Returns:
+            AsyncRunner: runner
+
+        Example:
+        ```
+            schedules = parser.resolve(parser.parse(schedule_str))
+            async with parser.runner(schedules, keep_alive=True) as runner:
+                handle = runner.add(other_schedule)
+                async for x in runner:
+                    print(x)
+        ```
+        """
+        return AsyncRunner(schedules, **kwargs)
+
 
 # TODO type hints for this
 def parse(
@@ -212,15 +369,36 @@ def stream(schedules: List["Schedule"]):
     return aiostream.stream.merge(*streams).stream()
 
 
-def resolve(parse_result, actions, functions) -> List["Schedule"]:
-    return list(_resolve_iter(parse_result, actions, functions))
+def resolve(
+    parse_result, actions, functions, max_rate=None, lazy=False
+) -> List["Schedule"]:
+    if lazy:
+        from .lazy import LazySchedule  # pylint: disable = C0415
+
+        schedules = [
+            LazySchedule(action, schedule, actions, functions)
+            for action, schedule in parse_result
+        ]
+    else:
+        schedules = list(_resolve_iter(parse_result, actions, functions))
+    if max_rate is not None:
+        from .analysis import check_budget  # pylint: disable = C0415
+
+        check_budget(schedules, max_rate)
+    return schedules
 
 
 def _resolve_iter(parse_result, allowed_actions, allowed_functions):
     for action, schedule in parse_result:
-        raction = resolve_action(action, allowed_actions, allowed_functions)
-        rschedule = resolve_schedule(schedule, allowed_functions)
-        yield VActionSchedule(raction, rschedule)
+        yield resolve_action_schedule(
+            action, schedule, allowed_actions, allowed_functions
+        )
+
+
+def resolve_action_schedule(action, schedule, valid_actions, valid_funcs):
+    raction = resolve_action(action, valid_actions, valid_funcs)
+    rschedule = resolve_schedule(schedule, valid_funcs)
+    return VActionSchedule(raction, rschedule)
 
 
 def resolve_schedule(schedule, valid_funcs):
@@ -0,0 +1,185 @@
+import asyncio
+import inspect
+import threading
+import time
+from dataclasses import dataclass
+
+__all__ = ("TimingStats", "PrecisionRunner", "sleep_until", "async_sleep_until")
+
+# the final stretch before a deadline is spent spinning rather than sleeping, OS sleep granularity is typically ~1ms.
+SPIN_NS = 2_000_000
+
+
+def sleep_until(deadline_ns: int, spin_ns: int = SPIN_NS):
+    """Blocks until `time.perf_counter_ns() >= deadline_ns`. Sleeps until `spin_ns` before the deadline then busy-waits the remainder."""
+    remaining = deadline_ns - time.perf_counter_ns()
+    if remaining > spin_ns:
+        time.sleep((remaining - spin_ns) / 1e9)
+    while time.perf_counter_ns() < deadline_ns:
+        pass
+
+
+async def async_sleep_until(deadline_ns: int, spin_ns: int = SPIN_NS):
+    """Asynchronous version of `sleep_until`. The spin phase yields to the event loop (`asyncio.sleep(0)`) on every check, so other tasks keep running, but their run time can make the deadline late. Always yields at least once, even if the deadline has passed."""
+    remaining = deadline_ns - time.perf_counter_ns()
+    if remaining > spin_ns:
+        await asyncio.sleep((remaining - spin_ns) / 1e9)
+    else:
+        await asyncio.sleep(0)
+    while time.perf_counter_ns() < deadline_ns:
+        await asyncio.sleep(0)
+
+
+@dataclass
+class TimingStats:
+    """dataclass recording achieved vs nominal timing of a precision run. Times are in seconds."""
+
+    firings: int = 0
+    nominal: float = 0.0  # sum of the intervals
+    elapsed: float = 0.0  # wall time from start to the latest firing
+    total_lateness: float = 0.0
+    max_lateness: float = 0.0
+    errors: int = 0  # actions or interval functions that raised
+
+    @property
+    def nominal_rate(self) -> float:
+        return self.firings / self.nominal if self.nominal > 0 else float("inf")
+
+    @property
+    def achieved_rate(self) -> float:
+        return self.firings / self.elapsed if self.elapsed > 0 else float("inf")
+
+    @property
+    def mean_lateness(self) -> float:
+        return self.total_lateness / self.firings if self.firings else 0.0
+
+    def _record(self, interval: float, start_ns: int, deadline_ns: int, now_ns: int):
+        lateness = (now_ns - deadline_ns) / 1e9
+        self.firings += 1
+        self.nominal += interval
+        self.elapsed = (now_ns - start_ns) / 1e9
+        self.total_lateness += lateness
+        self.max_lateness = max(self.max_lateness, lateness)
+
+
+class _PrecisionScheduleIterator:
+    """Async iterator that fires actions against absolute `perf_counter_ns` deadlines (the deadline advances by each interval, so lateness and action duration do not accumulate as drift)."""
+
+    def __init__(self, schedule, spin_ns: int = SPIN_NS):
+        super().__init__()
+        self._schedule = iter(schedule)._allow_async()
+        self._spin_ns = spin_ns
+        self._start = None
+        self._deadline = None
+        self._done = False
+        self.stats = TimingStats()
+
+    def __aiter__(self):
+        if self._done:
+            raise ValueError("Iterator already completed.")
+        return self
+
+    async def __anext__(self):
+        try:
+            interval, action = next(self._schedule)
+        except StopIteration:
+            self._done = True
+            # pylint: disable = W0707
+            raise StopAsyncIteration
+        if inspect.isawaitable(interval):  # async interval function
+            interval = float(await interval)
+        if self._start is None:
+            self._start = self._deadline = time.perf_counter_ns()
+        self._deadline += int(interval * 1e9)
+        await async_sleep_until(self._deadline, self._spin_ns)
+        self.stats._record(
+            interval, self._start, self._deadline, time.perf_counter_ns()
+        )
+        return action()
+
+    def cursor(self):
+        return self._schedule.cursor()
+
+
+class PrecisionRunner:
+    """Runs a single schedule with sleep-then-spin timing, either in the calling thread (`run`) or on a dedicated thread (`start`).
+
+    Example:
+    ```
+        runner = PrecisionRunner(schedule)
+        runner.start()
+        ...
+        runner.stop()
+        print(runner.stats.achieved_rate, runner.stats.nominal_rate)
+    ```
+    """
+
+    def __init__(
+        self, schedule, spin_ns: int = SPIN_NS, callback=None, error_callback=None
+    ):
+        """
+        Args:
+            schedule (Schedule): schedule to run.
+            spin_ns (int, optional): busy-wait this long before each deadline. Defaults to `SPIN_NS`.
+            callback (Callable, optional): called with the result of each action. Defaults to None.
+            error_callback (Callable, optional): called with the exception raised by an action (the schedule continues) or by an interval function (the schedule stops). Defaults to None.
+        """
+        self._schedule = schedule
+        self._spin_ns = spin_ns
+        self._callback = callback
+        self._error_callback = error_callback
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = TimingStats()
+
+    def run(self):
+        """Runs the schedule to completion (or until `stop`) in the calling thread."""
+        start = deadline = time.perf_counter_ns()
+        iterator = iter(self._schedule)
+        while True:
+            try:
+                item = next(iterator, None)
+            except Exception as error:  # pylint: disable = W0718
+                self._error(error)
+                return
+            if item is None:
+                return
+            interval, action = item
+            deadline += int(interval * 1e9)
+            # wake up early to check for stop requests on long intervals
+            while deadline - time.perf_counter_ns() > self._spin_ns + 50_000_000:
+                if self._stop.wait(0.05):
+                    return
+            sleep_until(deadline, self._spin_ns)
+            if self._stop.is_set():
+                return
+            self.stats._record(interval, start, deadline, time.perf_counter_ns())
+            try:
+                result = action()
+            except Exception as error:  # pylint: disable = W0718
+                self._error(error)
+                continue
+            if self._callback is not None:
+                self._callback(result)
+
+    def _error(self, error: Exception):
+        self.stats.errors += 1
+        if self._error_callback is not None:
+            self._error_callback(error)
+
+    def start(self):
+        """Runs the schedule on a dedicated daemon thread."""
+        if self._thread is not None:
+            raise ValueError("Runner already started.")
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None):
+        """Stops the runner and waits for its thread to finish."""
+        self._stop.set()
+        self.join(timeout)
+
+    def join(self, timeout: float = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
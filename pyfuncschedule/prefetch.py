@@ -0,0 +1,123 @@
+import asyncio
+import inspect
+import threading
+from collections import deque
+
+__all__ = ()
+
+_EXHAUSTED = object()
+
+
+class _Error:
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class _Prefetcher:
+    """Draws `(interval, action)` from a schedule iterator ahead of time, keeping up to `depth` items buffered. Only one draw is in flight at a time so the iterator is never advanced concurrently (and interval functions are called in schedule order).
+
+    The iterator runs ahead of the firings, so the iterator's cursor is saved with each buffered item and `cursor` is the position after the last item taken.
+    """
+
+    def __init__(self, iterator, depth: int):
+        assert depth > 0
+        self._iterator = iterator
+        self._depth = depth
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._running = False
+        self._exhausted = False
+        self._callback = None
+        self._cursor = iterator.cursor()
+
+    def take(self, callback):
+        """Takes the next item if it is ready (`_EXHAUSTED` at the end of the schedule), otherwise returns None and calls `callback` once an item is available."""
+        with self._lock:
+            if self._buffer:
+                item, cursor = self._buffer.popleft()
+                if cursor is not None:
+                    self._cursor = cursor
+            else:
+                item, self._callback = None, callback
+        self._fill()
+        if isinstance(item, _Error):
+            raise item.error
+        return item
+
+    def cursor(self):
+        """Position after the last item taken (excluding buffered items)."""
+        return self._cursor
+
+    def _fill(self):
+        with self._lock:
+            if self._running or self._exhausted or len(self._buffer) >= self._depth:
+                return
+            self._running = True
+        self._draw()
+
+    def _draw(self):
+        raise NotImplementedError()
+
+    def _put(self, item, cursor=None):
+        with self._lock:
+            self._buffer.append((item, cursor))
+            self._running = False
+            self._exhausted = item is _EXHAUSTED or isinstance(item, _Error)
+            callback, self._callback = self._callback, None
+        if callback is not None:
+            callback()
+        self._fill()
+
+
+class _ThreadPrefetcher(_Prefetcher):
+    """Draws on an executor, interval functions must be synchronous."""
+
+    def __init__(self, iterator, depth: int, executor):
+        super().__init__(iterator, depth)
+        self._executor = executor
+        self._fill()
+
+    def _draw(self):
+        self._executor.submit(self._next)
+
+    def _next(self):
+        try:
+            item = next(self._iterator, _EXHAUSTED)
+        except Exception as error:  # pylint: disable = W0718
+            item = _Error(error)
+        self._put(item, _cursor(self._iterator, item))
+
+
+class _AsyncPrefetcher(_Prefetcher):
+    """Draws on the event loop's default executor, intervals produced by async functions are awaited as tasks on the loop."""
+
+    def __init__(self, iterator, depth: int, loop: asyncio.AbstractEventLoop):
+        super().__init__(iterator._allow_async(), depth)
+        self._loop = loop
+        self._tasks = set()
+        self._fill()
+
+    def _draw(self):
+        task = self._loop.create_task(self._next())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _next(self):
+        try:
+            item = await self._loop.run_in_executor(
+                None, next, self._iterator, _EXHAUSTED
+            )
+            cursor = _cursor(self._iterator, item)
+            if item is not _EXHAUSTED and inspect.isawaitable(item[0]):
+                item = (float(await item[0]), item[1])
+        except Exception as error:  # pylint: disable = W0718
+            item, cursor = _Error(error), None
+        self._put(item, cursor)
+
+
+def _cursor(iterator, item):
+    """Position of `iterator` after drawing `item`, None if the schedule ended."""
+    if item is _EXHAUSTED or isinstance(item, _Error):
+        return None
+    return iterator.cursor()
@@ -0,0 +1,230 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Any
+
+from .prefetch import _ThreadPrefetcher
+from .timer import ScheduleHandle, RunnerStats, _Runner
+from .tracing import Tracer
+
+__all__ = ("ThreadedRunner", "run")
+
+
+class ThreadedRunner(_Runner):
+    """Runs many schedules without `asyncio` using a single scheduler thread. Deadlines are kept in one heap, the scheduler thread waits on a condition variable until the earliest deadline (or until the heap changes) and dispatches due actions to a thread pool. Schedules can be added, cancelled, paused and resumed from any thread while running.
+
+    Deadlines advance by each interval from the previous *scheduled* time, so action duration and lateness do not accumulate as drift. Interval functions are evaluated on the scheduler thread when the previous action is dispatched.
+
+    Example:
+    ```
+        with ThreadedRunner(schedules) as runner:
+            runner.join() # wait until all schedules are exhausted
+    ```
+    """
+
+    def __init__(
+        self,
+        schedules: List[Any] = (),
+        max_workers: int = None,
+        callback: Callable = None,
+        error_callback: Callable = None,
+        prefetch: int = 0,
+        tracer: Tracer = None,
+        spread: bool = False,
+        rate_limit: float = None,
+        burst: int = 1,
+    ):
+        """
+        Args:
+            schedules (List[Schedule], optional): schedules to run. Defaults to ().
+            max_workers (int, optional): size of the action thread pool, see `ThreadPoolExecutor`. Defaults to None.
+            callback (Callable, optional): called with the result of each action (on a worker thread). Defaults to None.
+            error_callback (Callable, optional): called with the exception raised by an action or interval function (on a worker thread). Defaults to None.
+            prefetch (int, optional): evaluate up to this many intervals of each schedule ahead of time on a separate thread pool, so that slow interval functions do not hold up the scheduler thread. NOTE: interval functions are then called before the preceding actions are taken. Defaults to 0.
+            tracer (Tracer, optional): record the scheduled time, start and end of each action. Defaults to None.
+            spread (bool, optional): spread the first firing of each schedule across its first interval (by a deterministic hash of its key) so that schedules added together do not all fire in phase. Defaults to False.
+            rate_limit (float, optional): maximum firings per second across all schedules (a token bucket), firings over the limit are delayed without changing the timing of later firings. Defaults to None.
+            burst (int, optional): number of firings allowed at once under `rate_limit`. Defaults to 1.
+        """
+        super().__init__(prefetch, spread, rate_limit, burst)
+        self._tracer = tracer
+        self._cond = self._lock = threading.Condition()
+        self._workers = threading.local()  # marks the action threads
+        self._executor = ThreadPoolExecutor(
+            max_workers,
+            thread_name_prefix="pyfuncschedule",
+            initializer=self._init_worker,
+        )
+        self._prefetch_executor = None
+        if prefetch:
+            self._prefetch_executor = ThreadPoolExecutor(
+                max_workers, thread_name_prefix="pyfuncschedule-prefetch"
+            )
+        self._callback = callback
+        self._error_callback = error_callback
+        self._thread = None
+        self._stopped = False
+        self._pending = 0  # actions dispatched but not yet finished
+        for schedule in schedules:
+            self.add(schedule)
+
+    def _notify(self):
+        self._cond.notify_all()
+
+    def _defer(self, func, *args):
+        # called with the lock held (e.g. on the scheduler thread), so `func` runs on the action thread pool
+        try:
+            self._executor.submit(func, *args)
+        except RuntimeError:  # stopped
+            pass
+
+    def _init_worker(self):
+        self._workers.active = True
+
+    def _make_prefetcher(self, iterator):
+        return _ThreadPrefetcher(iterator, self._prefetch, self._prefetch_executor)
+
+    def start(self):
+        """Starts the scheduler thread."""
+        if self._thread is not None:
+            raise ValueError("Runner already started.")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def join(self, timeout: float = None) -> bool:
+        """Waits until all schedules are exhausted or cancelled and their actions have finished (or the runner is stopped). Paused schedules are not waited for.
+
+        Returns:
+            bool: False if the timeout expired.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._stopped
+                or not (self._queue or self._waiting or self._pending),
+                timeout,
+            )
+
+    def stop(self, wait: bool = True):
+        """Stops the scheduler thread and shuts down the action thread pool.
+
+        Args:
+            wait (bool, optional): wait for running actions to finish, otherwise actions that have not yet started are cancelled. Defaults to True.
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        # an action thread (e.g. a callback calling `stop`) cannot wait for itself
+        in_worker = getattr(self._workers, "active", False)
+        self._executor.shutdown(wait=wait and not in_worker, cancel_futures=not wait)
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        if self._thread is None:
+            self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def _run(self):
+        queue, cond = self._queue, self._cond
+        with cond:
+            while not self._stopped:
+                deadline = queue.peek()
+                if deadline is None:
+                    cond.wait()
+                    continue
+                now = self._clock()
+                if deadline > now:
+                    cond.wait(deadline - now)
+                    continue
+                handle = queue.pop()
+                if self._throttle(handle, now):
+                    continue
+                self._dispatch(handle, now)
+                self._next(handle, handle._deadline)
+                if not queue:
+                    cond.notify_all()
+
+    def _dispatch(self, handle: ScheduleHandle, now: float):
+        self.stats._record_fire(now - handle._deadline, now)
+        self._pending += 1
+        # completion is handled on the action thread: a done callback would run right here (with the lock held) if the action had already finished
+        self._executor.submit(self._call, handle._action, handle._deadline)
+
+    def _call(self, action: Callable, scheduled: float):
+        try:
+            if self._tracer is None:
+                result = action()
+            else:
+                result = self._traced(action, scheduled)
+        except Exception as error:  # pylint: disable = W0718
+            self._done(None, error)
+        else:
+            self._done(result, None)
+
+    def _traced(self, action: Callable, scheduled: float):
+        tracer = self._tracer
+        start = tracer.clock()
+        try:
+            return action()
+        finally:
+            tracer.record(Tracer.FIRING, action, scheduled, start, tracer.clock())
+
+    def _done(self, result, error: Exception):
+        with self._cond:
+            self._pending -= 1
+            if error is None:
+                self.stats.completed += 1
+            else:
+                self.stats.errors += 1
+            self._cond.notify_all()
+        if error is not None:
+            if self._error_callback is not None:
+                self._error_callback(error)
+        elif self._callback is not None:
+            self._callback(result)
+
+
+def run(
+    schedules: List[Any],
+    max_workers: int = None,
+    callback: Callable = None,
+    error_callback: Callable = None,
+    prefetch: int = 0,
+    tracer: Tracer = None,
+    spread: bool = False,
+    rate_limit: float = None,
+    burst: int = 1,
+) -> RunnerStats:
+    """Runs the given schedules until they are all exhausted, blocking the calling thread. The schedules run on a `ThreadedRunner` (a scheduler thread that dispatches actions to a thread pool).
+
+    Example:
+    ```
+        schedules = parser.resolve(parser.parse(schedule_str))
+        run(schedules)
+    ```
+
+    Returns:
+        RunnerStats: statistics of the run.
+    """
+    runner = ThreadedRunner(
+        schedules,
+        max_workers,
+        callback,
+        error_callback,
+        prefetch,
+        tracer,
+        spread,
+        rate_limit,
+        burst,
+    )
+    runner.start()
+    try:
+        runner.join()
+    finally:
+        runner.stop()
+    return runner.stats
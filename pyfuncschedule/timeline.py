@@ -0,0 +1,185 @@
+import heapq
+import math
+from array import array
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Iterator, List, Tuple, Any
+
+from .parser import VSchedule, VFuncCall
+
+__all__ = ("Timeline", "firing_times", "iter_firing_times", "firing_histogram")
+
+_CHUNK = 4096
+_MAX_ZERO_STEPS = (
+    100000  # consecutive zero intervals before a dynamic schedule is considered stuck
+)
+
+
+@dataclass
+class Timeline:
+    """dataclass holding the merged firing times of many schedules in columnar form, sorted by time.
+
+    Attributes:
+        times (array): firing time of each firing (seconds since the schedules started).
+        index (array): index of the schedule that fired.
+        horizon (float): firings after this time are not included.
+    """
+
+    times: array
+    index: array
+    horizon: float
+
+    def __len__(self):
+        return len(self.times)
+
+    def histogram(self, bucket: float) -> array:
+        """Number of firings in each `bucket` seconds of the horizon."""
+        counts = array(
+            "L", bytes(array("L").itemsize * _num_buckets(self.horizon, bucket))
+        )
+        last = len(counts) - 1
+        for t in self.times:
+            counts[min(int(t // bucket), last)] += 1
+        return counts
+
+    def peak(self, bucket: float) -> Tuple[float, int]:
+        """Start time and number of firings of the busiest bucket."""
+        counts = self.histogram(bucket)
+        i = max(range(len(counts)), key=counts.__getitem__)
+        return i * bucket, counts[i]
+
+
+def firing_times(schedules: List[Any], horizon: float) -> Timeline:
+    """Merges the firing times of the given schedules up to `horizon` seconds.
+
+    Firing times of static schedules (those without interval functions) are computed one repeat block at a time and tiled. Interval functions are called as they would be when running, so the timeline of a dynamic schedule is one possible outcome.
+
+    Example:
+    ```
+        schedules = parser.resolve(parser.parse(schedule_str))
+        timeline = firing_times(schedules, horizon=24 * 60 * 60)
+        print(timeline.peak(bucket=1))
+    ```
+
+    Args:
+        schedules (List[Schedule]): schedules to merge.
+        horizon (float): time (seconds) up to which firings are included.
+
+    Returns:
+        Timeline: merged firings.
+    """
+    times, index = array("d"), array("l")
+    if len(schedules) == 1 and _static_block(schedules[0]._schedule) is not None:
+        for block in _static_times(schedules[0]._schedule, horizon):
+            times.extend(block)
+        index = array("l", bytes(index.itemsize * len(times)))
+    else:
+        # merging the sorted streams of each schedule keeps one repeat block of each in memory
+        append_time, append_index = times.append, index.append
+        for t, i in iter_firing_times(schedules, horizon):
+            append_time(t)
+            append_index(i)
+    return Timeline(times, index, horizon)
+
+
+def iter_firing_times(
+    schedules: List[Any], horizon: float
+) -> Iterator[Tuple[float, int]]:
+    """Lazily k-way merges the firing times of the given schedules up to `horizon` seconds, memory use is bounded by the number of schedules (plus one repeat block of each static schedule).
+
+    Yields:
+        Tuple[float, int]: firing time and index of the schedule that fired.
+    """
+    streams = [
+        _iter_indexed(schedule, i, horizon) for i, schedule in enumerate(schedules)
+    ]
+    return heapq.merge(*streams)
+
+
+def firing_histogram(schedules: List[Any], horizon: float, bucket: float) -> array:
+    """Number of firings of all schedules in each `bucket` seconds up to `horizon`. Firings are streamed, so this works for any number of firings.
+
+    Returns:
+        array: count of firings per bucket.
+    """
+    counts = array("L", bytes(array("L").itemsize * _num_buckets(horizon, bucket)))
+    last = len(counts) - 1
+    for schedule in schedules:  # no need to merge when counting
+        for t in _iter_times(schedule, horizon):
+            counts[min(int(t // bucket), last)] += 1
+    return counts
+
+
+def _num_buckets(horizon: float, bucket: float) -> int:
+    if bucket <= 0:
+        raise ValueError(f"Invalid bucket size: {bucket}")
+    return max(1, math.ceil(horizon / bucket))
+
+
+def _static_block(schedule: VSchedule):
+    """Intervals of one repeat of `schedule`, or None if they are not static (interval functions or nested infinite repeats)."""
+    intervals = []
+    for interval in schedule._intervals:
+        if isinstance(interval, VFuncCall):
+            return None
+        elif isinstance(interval, VSchedule):
+            if interval._repeat < 0:
+                return None
+            block = _static_block(interval)
+            if block is None:
+                return None
+            intervals.extend(block * interval._repeat)
+        else:
+            intervals.append(float(interval))
+    return intervals
+
+
+def _static_times(schedule: VSchedule, horizon: float) -> Iterator[array]:
+    """Firing times of a static schedule up to `horizon`, in chunks of whole repeat blocks."""
+    block = list(accumulate(_static_block(schedule)))
+    period = block[-1] if block else 0.0
+    repeat = math.inf if schedule._repeat < 0 else schedule._repeat
+    if period <= 0 and repeat == math.inf and block:
+        raise ValueError(f"Schedule {schedule} fires infinitely often at t=0.")
+    # tile several blocks per chunk so that short blocks are not handled one at a time
+    n = int(min(repeat, max(1, _CHUNK // max(1, len(block)))))
+    chunk = array("d", [t + k * period for k in range(n) for t in block])
+    k = 0
+    while k < repeat and k * period <= horizon:
+        n = int(min(n, repeat - k))
+        offset = k * period
+        if offset + n * period <= horizon:
+            yield array("d", [t + offset for t in chunk[: n * len(block)]])
+        else:  # final partial chunk
+            yield array(
+                "d",
+                [t + offset for t in chunk[: n * len(block)] if t + offset <= horizon],
+            )
+        k += n
+
+
+def _iter_indexed(schedule, i: int, horizon: float) -> Iterator[Tuple[float, int]]:
+    for t in _iter_times(schedule, horizon):
+        yield t, i
+
+
+def _iter_times(schedule, horizon: float) -> Iterator[float]:
+    if _static_block(schedule._schedule) is not None:
+        for block in _static_times(schedule._schedule, horizon):
+            yield from block
+        return
+    t = 0.0
+    zero_steps = 0
+    for interval, _ in schedule:
+        if interval > 0:
+            zero_steps = 0
+        else:
+            zero_steps += 1
+            if zero_steps > _MAX_ZERO_STEPS:
+                raise ValueError(
+                    f"Schedule {schedule} fires more than {_MAX_ZERO_STEPS} times at t={t}, it may fire infinitely often."
+                )
+        t += interval
+        if t > horizon:
+            return
+        yield t
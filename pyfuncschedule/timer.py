@@ -0,0 +1,393 @@
+import heapq
+import itertools
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, List
+
+from .prefetch import _EXHAUSTED
+
+__all__ = ("ScheduleHandle", "RunnerStats", "TokenBucket")
+
+
+@dataclass
+class RunnerStats:
+    """dataclass recording what a runner has done so far. Times are in seconds."""
+
+    fired: int = 0  # actions dispatched
+    completed: int = 0  # actions that returned
+    errors: int = 0  # actions that raised
+    total_lateness: float = 0.0
+    max_lateness: float = 0.0
+    throttled: int = 0  # firings delayed by the rate limit
+    total_throttle_delay: float = 0.0
+    peak_per_second: int = 0  # most firings in any one (clock) second
+    dropped: int = 0  # results discarded because the result buffer was full
+    _second: int = field(default=-1, repr=False, compare=False)
+    _second_count: int = field(default=0, repr=False, compare=False)
+
+    def _record_fire(self, lateness: float, now: float):
+        self.fired += 1
+        self.total_lateness += lateness
+        self.max_lateness = max(self.max_lateness, lateness)
+        second = int(now)
+        if second == self._second:
+            self._second_count += 1
+        else:
+            self._second, self._second_count = second, 1
+        self.peak_per_second = max(self.peak_per_second, self._second_count)
+
+
+class TokenBucket:
+    """Token bucket rate limiter: tokens accumulate at `rate` per second up to `burst`, each firing takes one. Tokens are reserved in advance (the balance may go negative) so waiting firings are served in order and the long-run rate is exactly `rate`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Invalid rate limit: rate={rate}, burst={burst}")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._time = None
+
+    def reserve(self, now: float) -> float:
+        """Takes a token, returns how long to wait before using it (0 if it is available now)."""
+        if self._time is not None:
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._time) * self.rate
+            )
+        self._time = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class ScheduleHandle:
+    """Handle to a schedule that has been added to a runner, see `add`, `cancel`, `pause` and `resume`."""
+
+    def __init__(self, schedule, key=None, cursor=None):
+        self.schedule = schedule
+        self.key = key
+        self._cursor = cursor  # resume from this position, see `_open`
+        self._iterator = None
+        self._action = None
+        self._deadline = None
+        self._remaining = None  # time until the deadline when paused
+        self._seq = None  # identifies the live heap entry, None if not queued
+        self._prefetcher = None
+        self._waiting = False  # waiting for a prefetched interval
+        self._base = None  # the next deadline is relative to this time
+        self._first = True  # the first firing has not been drawn yet
+        self._reserved = False  # throttled, a rate limit token is already reserved
+        self.done = False
+        self.cancelled = False
+
+    @property
+    def paused(self) -> bool:
+        return self._remaining is not None
+
+    def _open(self):
+        """Creates the iterator of the schedule, resuming from the cursor (if any)."""
+        cursor, self._cursor = self._cursor, None
+        schedule = self.schedule
+        self._iterator = iter(schedule) if cursor is None else schedule.resume(cursor)
+
+    def _advance(self, base: float) -> bool:
+        """Draws the next `(interval, action)` and sets the deadline relative to `base`, returns False if the schedule is exhausted."""
+        return self._set(next(self._iterator, _EXHAUSTED), base)
+
+    def _set(self, item, base: float) -> bool:
+        if item is _EXHAUSTED:
+            self.done = True
+            return False
+        interval, self._action = item
+        self._deadline = base + interval
+        return True
+
+    def _start(self, now: float, delay: float = None) -> bool:
+        """Sets the first deadline. If `delay` is given (e.g. the time remaining when a checkpoint was taken) it replaces the first interval."""
+        if delay is None:
+            return self._advance(now)
+        self._first = False
+        self._action = self.schedule._action
+        self._deadline = now + delay
+        return True
+
+    def cursor(self):
+        """Position of the schedule, the pending firing (if any) has already been drawn. With prefetch this excludes the intervals drawn ahead of time."""
+        if self._prefetcher is not None:
+            return self._prefetcher.cursor()
+        return self._iterator.cursor()
+
+    def __repr__(self):
+        return f"ScheduleHandle({self.key}, {self.schedule})"
+
+
+class _TimerQueue:
+    """Deadline heap of `ScheduleHandle`s. Removal is lazy: a heap entry is live only while its sequence number matches the handle's `_seq`."""
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def push(self, handle: ScheduleHandle, when: float = None):
+        """Queues `handle` at its deadline (or at `when`)."""
+        if handle._seq is not None:
+            self._size -= 1
+        handle._seq = next(self._counter)
+        when = handle._deadline if when is None else when
+        heapq.heappush(self._heap, (when, handle._seq, handle))
+        self._size += 1
+
+    def discard(self, handle: ScheduleHandle):
+        if handle._seq is not None:
+            handle._seq = None
+            self._size -= 1
+
+    def _prune(self):
+        heap = self._heap
+        while heap and heap[0][2]._seq != heap[0][1]:
+            heapq.heappop(heap)
+
+    def peek(self) -> float:
+        """Earliest deadline, or None if the queue is empty."""
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def pop(self) -> ScheduleHandle:
+        self._prune()
+        _, _, handle = heapq.heappop(self._heap)
+        handle._seq = None
+        self._size -= 1
+        return handle
+
+    def handles(self):
+        return [handle for _, seq, handle in self._heap if handle._seq == seq]
+
+
+class _Runner:
+    """Schedule bookkeeping shared by runners. All changes to the timer queue happen while holding `_lock`, after which `_notify` wakes the timer so that it can re-check the earliest deadline. Cancelling and pausing remove heap entries lazily, adding and resuming push one entry, so each is O(log n) and other schedules' deadlines are untouched."""
+
+    def __init__(
+        self,
+        prefetch: int = 0,
+        spread: bool = False,
+        rate_limit: float = None,
+        burst: int = 1,
+    ):
+        self._queue = _TimerQueue()
+        self._spread = spread
+        self._bucket = None if rate_limit is None else TokenBucket(rate_limit, burst)
+        self._paused = {}  # paused handles, so that they appear in checkpoints
+        self._keys = itertools.count()
+        self._prefetch = prefetch
+        self._waiting = {}  # handles waiting for a prefetched interval
+        self._error_callback = None
+        self.stats = RunnerStats()
+
+    def _clock(self) -> float:
+        return time.monotonic()
+
+    def _notify(self):
+        raise NotImplementedError()
+
+    def _defer(self, func, *args):
+        """Calls `func(*args)` on the timer's thread, without the lock held."""
+        raise NotImplementedError()
+
+    def _make_prefetcher(self, iterator):
+        raise NotImplementedError()
+
+    def _phase(self, handle: ScheduleHandle, base: float):
+        """With `spread`, moves the first firing of `handle` to a fraction of its first interval. The fraction is a hash of the key, so it is deterministic and different schedules get different phases."""
+        handle._first = False
+        if self._spread:
+            fraction = zlib.crc32(str(handle.key).encode()) / 2**32
+            handle._deadline = base + fraction * (handle._deadline - base)
+
+    def _throttle(self, handle: ScheduleHandle, now: float) -> bool:
+        """Applies the rate limit to a due handle. Returns True if the firing must wait, in which case the handle is re-queued for when its token is available. Its deadline is unchanged so later firings keep their timing. Must be called with the lock held."""
+        if self._bucket is None:
+            return False
+        if handle._reserved:
+            handle._reserved = False
+            return False
+        wait = self._bucket.reserve(now)
+        if wait <= 0:
+            return False
+        handle._reserved = True
+        self.stats.throttled += 1
+        self.stats.total_throttle_delay += wait
+        self._queue.push(handle, now + wait)
+        return True
+
+    def _next(self, handle: ScheduleHandle, base: float):
+        """Draws the next firing of `handle` (relative to `base`) and queues it. With prefetch, if the interval is not ready yet the handle waits and is queued by `_ready` instead. Must be called with the lock held."""
+        if self._prefetch and handle._prefetcher is None:
+            handle._prefetcher = self._make_prefetcher(handle._iterator)
+        try:
+            if handle._prefetcher is None:
+                ok = handle._advance(base)
+            else:
+                item = handle._prefetcher.take(lambda: self._ready(handle))
+                if item is None:
+                    handle._base, handle._waiting = base, True
+                    self._waiting[id(handle)] = handle
+                    return
+                ok = handle._set(item, base)
+        except Exception as error:  # pylint: disable = W0718
+            self._fail(handle, error)
+            return
+        if not ok:
+            return
+        if handle._first:
+            self._phase(handle, base)
+        if handle.paused:
+            handle._remaining = max(0.0, handle._deadline - self._clock())
+        else:
+            self._queue.push(handle)
+
+    def _ready(self, handle: ScheduleHandle):
+        """Called (from any thread) when a prefetched interval becomes available."""
+        with self._lock:
+            if not handle._waiting:
+                return
+            handle._waiting = False
+            del self._waiting[id(handle)]
+            if not handle.cancelled:
+                self._next(handle, handle._base)
+            self._notify()
+
+    def _fail(self, handle: ScheduleHandle, error: Exception):
+        """An interval could not be produced, the schedule is stopped."""
+        handle.done = True
+        self.stats.errors += 1
+        if self._error_callback is not None:
+            self._defer(self._error_callback, error)
+
+    def add(
+        self, schedule, key: Any = None, cursor=None, delay: float = None
+    ) -> ScheduleHandle:
+        """Adds a schedule, this may be called from any thread while the runner is running. If the first interval cannot be drawn (e.g. its function raises, or a lazy schedule does not resolve) the error is reported to `error_callback` and the schedule is stopped, as for later intervals.
+
+        Args:
+            schedule (Schedule): schedule to add.
+            key (Any, optional): identifies the schedule in `checkpoint`. Defaults to the order in which schedules were added.
+            cursor (ScheduleCursor, optional): resume from this position. Defaults to None.
+            delay (float, optional): time until the first firing, replaces the first interval. Defaults to None.
+
+        Returns:
+            ScheduleHandle: handle to the added schedule.
+        """
+        with self._lock:
+            key = next(self._keys) if key is None else key
+        handle = ScheduleHandle(schedule, key=key, cursor=cursor)
+        now = self._clock()
+        # with prefetch the first interval is drawn on the prefetch thread
+        prefetched = self._prefetch and delay is None
+        try:
+            handle._open()
+            started = prefetched or handle._start(now, delay)
+        except Exception as error:  # pylint: disable = W0718
+            with self._lock:
+                self._fail(handle, error)
+            return handle
+        if prefetched:
+            with self._lock:
+                handle._base, handle._waiting = now, True
+                self._waiting[id(handle)] = handle
+            self._defer(self._ready, handle)
+        elif started:
+            if handle._first:
+                self._phase(handle, now)
+            with self._lock:
+                self._queue.push(handle)
+                self._notify()
+        return handle
+
+    def cancel(self, handle: ScheduleHandle):
+        """Removes a schedule from the runner, its pending firing will not happen. Actions that are already running are not interrupted."""
+        with self._lock:
+            self._queue.discard(handle)
+            self._paused.pop(id(handle), None)
+            handle.cancelled = True
+            handle._remaining = None
+            self._notify()
+
+    def pause(self, handle: ScheduleHandle):
+        """Pauses a schedule, the time remaining until its next firing is preserved and continues to count down after `resume`."""
+        with self._lock:
+            if handle.cancelled or handle.done or handle.paused:
+                return
+            if handle._waiting:
+                handle._remaining = 0.0  # set properly once the interval is ready
+            else:
+                handle._remaining = max(0.0, handle._deadline - self._clock())
+            self._queue.discard(handle)
+            self._paused[id(handle)] = handle
+            self._notify()
+
+    def resume(self, handle: ScheduleHandle):
+        """Resumes a paused schedule."""
+        with self._lock:
+            if not handle.paused:
+                return
+            remaining, handle._remaining = handle._remaining, None
+            del self._paused[id(handle)]
+            if not handle._waiting:
+                handle._deadline = self._clock() + remaining
+                self._queue.push(handle)
+            self._notify()
+
+    def checkpoint(self) -> List[dict]:
+        """Snapshot of the position of every live schedule (including paused ones), can be written with `cursor.save` and passed to `restore`.
+
+        Returns:
+            List[dict]: `{"key", "cursor", "remaining"}` for each live schedule. `remaining` is None for schedules waiting for a prefetched interval, their next interval is drawn again on restore.
+        """
+        with self._lock:
+            now = self._clock()
+            state = [
+                {
+                    "key": handle.key,
+                    "cursor": handle.cursor(),
+                    "remaining": max(0.0, handle._deadline - now),
+                }
+                for handle in self._queue.handles()
+            ]
+            state.extend(
+                {
+                    "key": handle.key,
+                    "cursor": handle.cursor(),
+                    "remaining": None if handle._waiting else handle._remaining,
+                }
+                for handle in self._paused.values()
+            )
+            state.extend(
+                {"key": handle.key, "cursor": handle.cursor(), "remaining": None}
+                for handle in self._waiting.values()
+                if not (handle.cancelled or handle.paused)
+            )
+            return state
+
+    def restore(self, state: List[dict], schedules) -> List[ScheduleHandle]:
+        """Adds schedules from a `checkpoint`.
+
+        Args:
+            state (List[dict]): result of `checkpoint`.
+            schedules (List[Schedule] | Dict[Any, Schedule]): the schedules, indexed by key.
+
+        Returns:
+            List[ScheduleHandle]: handles to the restored schedules.
+        """
+        return [
+            self.add(
+                schedules[entry["key"]],
+                key=entry["key"],
+                cursor=entry["cursor"],
+                delay=entry["remaining"],
+            )
+            for entry in state
+        ]
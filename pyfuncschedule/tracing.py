@@ -0,0 +1,130 @@
+import itertools
+import json
+import os
+import threading
+import time
+from array import array
+from typing import Any, List
+
+__all__ = ("Tracer",)
+
+
+class Tracer:
+    """Records trace events into a fixed-size ring buffer, the oldest events are overwritten once it is full. Recording an event stores a few numbers and a reference to the action (no formatting), names are only produced on export.
+
+    Tracing is opt-in: pass `tracer=` to a runner to record each firing (scheduled time, start, end), and/or `install` the tracer to record every `VFuncCall` (actions and interval functions). When disabled the only cost is a `None` check.
+
+    Example:
+    ```
+        tracer = Tracer()
+        async with parser.runner(schedules, tracer=tracer) as runner:
+            ...
+        tracer.dump("trace.json") # open with chrome://tracing or https://ui.perfetto.dev
+    ```
+    """
+
+    FIRING = 0  # an action fired by a runner
+    CALL = 1  # a call to a `VFuncCall`
+
+    def __init__(self, capacity: int = 65536, clock=time.monotonic):
+        """
+        Args:
+            capacity (int, optional): maximum number of events kept. Defaults to 65536.
+            clock (Callable, optional): clock used for timestamps, must match the runner's clock. Defaults to `time.monotonic`.
+        """
+        if capacity <= 0:
+            raise ValueError(f"Invalid capacity: {capacity}")
+        self.capacity = capacity
+        self.clock = clock
+        self._counter = itertools.count()
+        self._recorded = 0  # events recorded so far, published under `_lock`
+        self._lock = threading.Lock()
+        self._kind = array("b", bytes(capacity))
+        self._scheduled = array("d", bytes(8 * capacity))
+        self._start = array("d", bytes(8 * capacity))
+        self._end = array("d", bytes(8 * capacity))
+        self._thread = array("Q", bytes(8 * capacity))
+        self._what = [None] * capacity
+        self._origin = clock()
+
+    def record(self, kind: int, what: Any, scheduled: float, start: float, end: float):
+        """Records an event. `scheduled` may be NaN if the event had no scheduled time."""
+        n = next(self._counter)  # atomic under the GIL
+        i = n % self.capacity
+        self._kind[i] = kind
+        self._what[i] = what
+        self._scheduled[i] = scheduled
+        self._start[i] = start
+        self._end[i] = end
+        self._thread[i] = threading.get_ident()
+        with self._lock:  # other threads may be publishing later events
+            if n >= self._recorded:
+                self._recorded = n + 1
+
+    def install(self):
+        """Records every `VFuncCall` (action or interval function call) until `uninstall`."""
+        from .parser import VFuncCall  # pylint: disable = C0415
+
+        VFuncCall._tracer = self
+        return self
+
+    def uninstall(self):
+        from .parser import VFuncCall  # pylint: disable = C0415
+
+        if VFuncCall._tracer is self:
+            VFuncCall._tracer = None
+
+    def __len__(self):
+        return min(self._recorded, self.capacity)
+
+    @property
+    def dropped(self) -> int:
+        """Number of events that have been overwritten."""
+        return max(0, self._recorded - self.capacity)
+
+    def events(self) -> List[dict]:
+        """Recorded events, oldest first. Times are in seconds since the tracer was created."""
+        n = self._recorded
+        first = max(0, n - self.capacity)
+        events = []
+        for j in range(first, n):
+            i = j % self.capacity
+            events.append(
+                {
+                    "kind": "firing" if self._kind[i] == Tracer.FIRING else "call",
+                    "name": str(self._what[i]),
+                    "scheduled": self._scheduled[i] - self._origin,
+                    "start": self._start[i] - self._origin,
+                    "end": self._end[i] - self._origin,
+                    "thread": self._thread[i],
+                }
+            )
+        return events
+
+    def to_chrome_trace(self) -> dict:
+        """Converts the recorded events to the Chrome trace event format (also read by Perfetto). Each event becomes a complete ("X") event on its thread, firings carry their scheduled time and lateness in `args`."""
+        pid = os.getpid()
+        trace = []
+        for event in self.events():
+            args = {}
+            if event["scheduled"] == event["scheduled"]:  # not NaN
+                args["scheduled_us"] = event["scheduled"] * 1e6
+                args["lateness_us"] = (event["start"] - event["scheduled"]) * 1e6
+            trace.append(
+                {
+                    "name": event["name"],
+                    "cat": event["kind"],
+                    "ph": "X",
+                    "ts": event["start"] * 1e6,
+                    "dur": (event["end"] - event["start"]) * 1e6,
+                    "pid": pid,
+                    "tid": event["thread"],
+                    "args": args,
+                }
+            )
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def dump(self, path: str):
+        """Writes `to_chrome_trace` to `path` as JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
@@ -0,0 +1,19 @@
+from pyfuncschedule import ScheduleParser
+
+
+def make_parser(actions=(), functions=()) -> ScheduleParser:
+    """`ScheduleParser` with the given actions and functions registered, each given as a callable or a `(name, callable)` pair."""
+    parser = ScheduleParser()
+    for register, funcs in (
+        (parser.register_action, actions),
+        (parser.register_function, functions),
+    ):
+        for func in funcs:
+            name, func = func if isinstance(func, tuple) else (None, func)
+            register(func, name=name)
+    return parser
+
+
+def resolve(parser: ScheduleParser, schedule: str, **kwargs):
+    """Parses and resolves `schedule`."""
+    return parser.resolve(parser.parse(schedule), **kwargs)
@@ -0,0 +1,63 @@
+import math
+import unittest
+from pyfuncschedule import interval_bounds, check_budget
+from helpers import make_parser, resolve
+
+
+class TestAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        @interval_bounds(0.5, 2)
+        def bounded():
+            return 1
+
+        self.parser = make_parser(
+            [("foo", lambda: None)], [bounded, ("unbounded", lambda: 1)]
+        )
+
+    def test_static(self):
+        schedule = resolve(self.parser, """foo()@[1,[1,[2]:2]:2]:2""")[0]
+        intervals = [interval for interval, _ in schedule]
+        stats = schedule.stats
+        self.assertEqual(stats.count, len(intervals))
+        self.assertEqual(stats.duration, (sum(intervals), sum(intervals)))
+        self.assertEqual(stats.period, (sum(intervals) / 2,) * 2)
+        self.assertEqual(stats.period_count, len(intervals) / 2)
+        self.assertEqual(stats.min_interval, (1.0, 1.0))
+        self.assertEqual(stats.peak_rate, 1.0)
+        self.assertTrue(stats.finite)
+
+    def test_infinite(self):
+        stats = resolve(self.parser, """foo()@[1,[2]:3]:*""")[0].stats
+        self.assertEqual(stats.count, math.inf)
+        self.assertEqual(stats.duration, (math.inf, math.inf))
+        self.assertEqual(stats.period, (7.0, 7.0))
+        self.assertEqual(stats.mean_rate, (4 / 7, 4 / 7))
+        self.assertFalse(stats.finite)
+
+    def test_function_bounds(self):
+        stats = resolve(self.parser, """foo()@[1, bounded()]:*""")[0].stats
+        self.assertEqual(stats.period, (1.5, 3.0))
+        self.assertEqual(stats.min_interval, (0.5, 1.0))
+        self.assertEqual(stats.peak_rate, 2.0)
+        stats = resolve(self.parser, """foo()@[1, unbounded()]:*""")[0].stats
+        self.assertEqual(stats.period, (1.0, math.inf))
+        self.assertEqual(stats.peak_rate, math.inf)
+
+    def test_budget(self):
+        source = "\n".join("foo()@[0.1]:*" for _ in range(10))
+        self.assertEqual(len(resolve(self.parser, source, max_rate=100)), 10)
+        with self.assertRaises(ValueError):
+            resolve(self.parser, source, max_rate=99)
+        schedules = resolve(self.parser, """foo()@[0, 10]:*""")
+        with self.assertRaises(ValueError):
+            check_budget(schedules, 1)
+        check_budget(schedules, 1, peak=False)
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            interval_bounds(2, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import unittest
+from helpers import make_parser, resolve
+
+
+class TestAsyncRunner(unittest.TestCase):
+
+    def setUp(self):
+        def foo(name):
+            return name
+
+        async def bar(name):
+            await asyncio.sleep(0.001)
+            return name
+
+        counter = iter(range(1000))
+
+        def count():
+            return next(counter)
+
+        self.parser = make_parser([foo, bar, count])
+
+    def test_merge(self):
+        async def main():
+            schedules = resolve(
+                self.parser, """foo("a")@[0.01]:3 \n foo("b")@[0.025]:2"""
+            )
+            async with self.parser.runner(schedules) as runner:
+                return [x async for x in runner], runner.stats
+
+        results, stats = asyncio.run(main())
+        self.assertListEqual(results, ["a", "a", "b", "a", "b"])
+        self.assertEqual(stats.fired, 5)
+
+    def test_async_action(self):
+        async def main():
+            async with self.parser.runner(
+                resolve(self.parser, """bar("a")@[0]:3""")
+            ) as runner:
+                return [x async for x in runner]
+
+        self.assertListEqual(asyncio.run(main()), ["a", "a", "a"])
+
+    def test_add_cancel(self):
+        async def main():
+            a, b = resolve(self.parser, """foo("a")@[0.01]:* \n foo("b")@[0.001]:*""")
+            async with self.parser.runner([a], keep_alive=True) as runner:
+                results = []
+                async for x in runner:
+                    results.append(x)
+                    if len(results) == 2:
+                        handle = runner.add(b)
+                    elif results.count("b") == 5:
+                        runner.cancel(handle)
+                        self.assertTrue(handle.cancelled)
+                        break
+                return results
+
+        results = asyncio.run(main())
+        self.assertEqual(results[:2], ["a", "a"])
+        self.assertEqual(results.count("b"), 5)
+
+    def test_zero_interval(self):
+        async def main():
+            schedules = resolve(self.parser, """foo("a")@[0]:*""")
+            async with self.parser.runner(schedules) as runner:
+                results = []
+                async for x in runner:
+                    results.append(x)
+                    if len(results) == 100:
+                        break
+                return results
+
+        results = asyncio.run(asyncio.wait_for(main(), 5))
+        self.assertEqual(len(results), 100)
+
+    def test_concurrent_consumers(self):
+        async def consume(runner):
+            return [x async for x in runner]
+
+        async def main():
+            schedules = resolve(self.parser, """count()@[0.01]:6""")
+            async with self.parser.runner(schedules) as runner:
+                return await asyncio.gather(consume(runner), consume(runner))
+
+        a, b = asyncio.run(asyncio.wait_for(main(), 5))
+        self.assertListEqual(sorted(a + b), list(range(6)))
+
+    def test_pause_resume(self):
+        async def main():
+            (a,) = resolve(self.parser, """foo("a")@[0.02]:2""")
+            async with self.parser.runner([a]) as runner:
+                handle = runner.add(a)
+                runner.pause(handle)
+                self.assertTrue(handle.paused)
+                self.assertEqual(len(runner.checkpoint()), 2)
+                results = [await runner.__anext__(), await runner.__anext__()]
+                runner.resume(handle)
+                results.extend([x async for x in runner])
+                return results, runner.stats
+
+        results, stats = asyncio.run(main())
+        self.assertEqual(len(results), 4)
+        self.assertEqual(stats.fired, 4)
+
+    def test_rate_limit(self):
+        async def main():
+            schedules = resolve(
+                self.parser, "\n".join('foo("a")@[0]:5' for _ in range(10))
+            )
+            async with self.parser.runner(schedules, rate_limit=1000) as runner:
+                return [x async for x in runner], runner.stats
+
+        results, stats = asyncio.run(main())
+        self.assertEqual(len(results), 50)
+        self.assertEqual(stats.throttled, 49)
+        self.assertLessEqual(stats.peak_per_second, 50)
+
+    def test_threadsafe_add(self):
+        async def main():
+            (a,) = resolve(self.parser, """foo("a")@[0.001]:3""")
+            async with self.parser.runner([], keep_alive=True) as runner:
+                thread = threading.Thread(target=runner.add, args=(a,))
+                thread.start()
+                results = [await runner.__anext__() for _ in range(3)]
+                thread.join()
+                return results
+
+        self.assertListEqual(asyncio.run(main()), ["a", "a", "a"])
+
+    def slow_consumer(self, overflow, delay=0.1):
+        async def main():
+            schedules = resolve(self.parser, """count()@[0.002]:10""")
+            async with self.parser.runner(
+                schedules, buffer_size=2, overflow=overflow
+            ) as runner:
+                await asyncio.sleep(delay)
+                results = []
+                async for x in runner:
+                    results.append(x)
+                    await asyncio.sleep(0.005)
+                return results, runner.stats
+
+        return asyncio.run(main())
+
+    def test_overflow_drop_newest(self):
+        results, stats = self.slow_consumer("drop_newest")
+        self.assertListEqual(results, [0, 1])
+        self.assertEqual(stats.dropped, 8)
+
+    def test_overflow_drop_oldest(self):
+        results, stats = self.slow_consumer("drop_oldest")
+        self.assertListEqual(results, [8, 9])
+        self.assertEqual(stats.fired, 10)
+
+    def test_overflow_sample(self):
+        results, stats = self.slow_consumer("sample")
+        self.assertListEqual(results, [0, 9])
+        self.assertEqual(stats.dropped, 8)
+        # firings are not delayed by the consumer
+        self.assertLess(stats.max_lateness, 0.05)
+
+    def test_overflow_block(self):
+        results, stats = self.slow_consumer("block")
+        self.assertListEqual(results, list(range(10)))
+        self.assertEqual(stats.dropped, 0)
+        self.assertGreater(stats.max_lateness, 0.05)
+
+    def test_invalid_overflow(self):
+        with self.assertRaises(ValueError):
+            self.parser.runner([], overflow="oldest")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import asyncio
+import unittest
+from pyfuncschedule import LazySchedule, ThreadedRunner, validate, run
+from helpers import make_parser, resolve
+
+
+class TestLazySchedule(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+        def foo(name):
+            self.calls.append(name)
+            return name
+
+        def half():
+            return 0.5
+
+        self.parser = make_parser([foo], [half])
+
+    def test_lazy(self):
+        (schedule,) = resolve(
+            self.parser, """foo("a")@[[1, half()]:2, 2]:2""", lazy=True
+        )
+        self.assertIsInstance(schedule, LazySchedule)
+        self.assertEqual(schedule.name, "foo")
+        self.assertEqual(schedule.first_interval, 1.0)
+        it = iter(schedule)
+        interval, action = next(it)
+        self.assertEqual(interval, 1.0)
+        self.assertFalse(schedule.resolved)
+        self.assertEqual(action(), "a")  # the first firing resolves
+        self.assertTrue(schedule.resolved)
+        (eager,) = resolve(self.parser, """foo("a")@[[1, half()]:2, 2]:2""")
+        self.assertListEqual(
+            [interval for interval, _ in it],
+            [interval for interval, _ in eager][1:],
+        )
+
+    def test_dynamic_first_interval(self):
+        (schedule,) = resolve(self.parser, """foo("a")@[half(), 1]""", lazy=True)
+        self.assertIsNone(schedule.first_interval)
+        self.assertEqual(next(iter(schedule))[0], 0.5)
+        self.assertTrue(schedule.resolved)
+
+    def test_cursor(self):
+        (schedule,) = resolve(self.parser, """foo("a")@[1, 2, 3]""", lazy=True)
+        it = iter(schedule)
+        next(it)
+        self.assertFalse(schedule.resolved)
+        it = schedule.resume(it.cursor())
+        self.assertListEqual([interval for interval, _ in it], [2.0, 3.0])
+
+    def test_nested_cursor(self):
+        source = """foo("a")@[[[1, half()]:2, 3]:2]"""
+        (schedule,) = resolve(self.parser, source, lazy=True)
+        (eager,) = resolve(self.parser, source)
+        it, eager_it = iter(schedule), iter(eager)
+        next(it), next(eager_it)
+        self.assertEqual(it.cursor(), eager_it.cursor())
+        self.assertFalse(schedule.resolved)
+
+    def test_checkpoint(self):
+        schedules = resolve(
+            self.parser, """foo("a")@[1, 2] \n foo("b")@[[1]:2]""", lazy=True
+        )
+        with ThreadedRunner(schedules) as runner:
+            state = runner.checkpoint()
+            runner.stop(wait=False)
+        self.assertFalse(any(s.resolved for s in schedules))
+        self.assertListEqual([entry["cursor"].count for entry in state], [1, 1])
+
+    def test_stats(self):
+        (schedule,) = resolve(self.parser, """foo("a")@[1, 2]:3""", lazy=True)
+        self.assertEqual(schedule.stats.count, 6)
+
+    def test_validate(self):
+        schedules = resolve(
+            self.parser, """foo("a")@[1] \n bar()@[1] \n foo()@[1]""", lazy=True
+        )
+        errors = validate(schedules)
+        self.assertListEqual([s.name for s, _ in errors], ["bar", "foo"])
+        self.assertFalse(any(s.resolved for s in schedules))
+        errors = validate(schedules, background=True).result(timeout=5)
+        self.assertEqual(len(errors), 2)
+        with self.assertRaises(ValueError):
+            schedules[1].resolve()
+
+    def test_run(self):
+        errors = []
+        schedules = resolve(
+            self.parser, """foo("a")@[0.01]:2 \n bar()@[0.01]:2""", lazy=True
+        )
+        stats = run(schedules, error_callback=errors.append)
+        self.assertListEqual(self.calls, ["a", "a"])
+        self.assertEqual(stats.completed, 2)
+        # the invalid schedule is reported once, then stops
+        self.assertEqual(stats.errors, 1)
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], ValueError)
+
+    def test_run_dynamic_first_interval(self):
+        errors = []
+        schedules = resolve(
+            self.parser, """foo("a")@[0.01]:2 \n bar()@[half()]:2""", lazy=True
+        )
+        stats = run(schedules, error_callback=errors.append)
+        self.assertListEqual(self.calls, ["a", "a"])
+        self.assertEqual(stats.errors, 1)
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], ValueError)
+
+    def test_async_run(self):
+        async def main():
+            errors = []
+            schedules = resolve(
+                self.parser,
+                """foo("a")@[0.01]:2 \n bar()@[0.01]:2 \n bar()@[half()]:2""",
+                lazy=True,
+            )
+            async with self.parser.runner(
+                schedules, error_callback=errors.append
+            ) as runner:
+                return [x async for x in runner], runner.stats, errors
+
+        results, stats, errors = asyncio.run(main())
+        self.assertListEqual(results, ["a", "a"])
+        self.assertEqual(stats.errors, 2)
+        self.assertEqual(len(errors), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from pyparsing import ParseBaseException
+
+from pyfuncschedule import parse, parse_parallel, ScheduleParser
+from pyfuncschedule.parallel import split_statements
+
+STATEMENTS = [
+    'foo("a]#b", [1, 2])@[1, [0.5]:2]:3',
+    '# a comment with foo()@[1]\nbar({"k": 1})@[\n    0.1, # inside\n    rand()\n]:*',
+    "foo(1 + 2)@[0.25] # trailing comment",
+    "bar()@[]",
+]
+
+
+def source(n):
+    return "\n".join(STATEMENTS[i % len(STATEMENTS)] for i in range(n))
+
+
+class TestParseParallel(unittest.TestCase):
+
+    def test_split(self):
+        schedule = source(40)
+        offsets = split_statements(schedule, 100)
+        self.assertGreater(len(offsets), 5)
+        self.assertEqual(offsets[0], 0)
+        # each chunk parses on its own and together they give the whole result
+        result = []
+        for start, end in zip(offsets, offsets[1:] + [None]):
+            result.extend(parse(schedule[start:end]))
+        self.assertEqual(result, parse(schedule))
+
+    def test_parallel(self):
+        schedule = source(200)
+        result = parse_parallel(schedule, processes=2, min_chunk_size=500)
+        self.assertEqual(len(result), 200)
+        self.assertEqual(result, parse(schedule))
+
+    def test_small(self):
+        schedule = source(4)
+        self.assertEqual(parse_parallel(schedule, processes=2), parse(schedule))
+
+    def test_commented_out(self):
+        lines = ['foo("a")@[1]:3'] * 100
+        schedule = "\n".join(lines + ["# foo()@[1]:*"] * 100 + lines)
+        result = parse_parallel(schedule, processes=2, min_chunk_size=500)
+        self.assertEqual(len(result), 200)
+        self.assertEqual(result, parse(schedule))
+
+    def test_error_line(self):
+        lines = source(200).split("\n")
+        lineno = len(lines) - 10
+        lines[lineno - 1] = "foo(@[1]"
+        schedule = "\n".join(lines)
+        with self.assertRaises(ParseBaseException) as serial:
+            parse(schedule)
+        with self.assertRaises(ParseBaseException) as parallel:
+            parse_parallel(schedule, processes=2, min_chunk_size=500)
+        self.assertEqual(parallel.exception.lineno, lineno)
+        self.assertEqual(parallel.exception.lineno, serial.exception.lineno)
+
+    def test_parser_processes(self):
+        parser = ScheduleParser()
+        schedule = source(8)
+        self.assertEqual(parser.parse(schedule, processes=2), parser.parse(schedule))
+
+
+if __name__ == "__main__":
+    unittest.main()
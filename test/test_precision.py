@@ -0,0 +1,121 @@
+import asyncio
+import time
+import unittest
+from pyfuncschedule import PrecisionRunner
+from helpers import make_parser, resolve
+
+
+class TestPrecision(unittest.TestCase):
+
+    def setUp(self):
+        self.count = 0
+
+        def foo():
+            self.count += 1
+            return self.count
+
+        self.parser = make_parser([foo])
+
+    def test_runner(self):
+        runner = PrecisionRunner(resolve(self.parser, """foo()@[0.0005]:200""")[0])
+        runner.run()
+        self.assertEqual(self.count, 200)
+        self.assertEqual(runner.stats.firings, 200)
+        self.assertAlmostEqual(runner.stats.nominal_rate, 2000.0)
+        # absolute deadlines - the run can't finish early
+        self.assertGreaterEqual(runner.stats.elapsed, 0.1)
+        self.assertGreater(runner.stats.achieved_rate, 1000.0)
+
+    def test_runner_thread_stop(self):
+        results = []
+        runner = PrecisionRunner(
+            resolve(self.parser, """foo()@[0.001]:*""")[0], callback=results.append
+        )
+        runner.start()
+        time.sleep(0.05)
+        runner.stop()
+        self.assertGreater(len(results), 0)
+        self.assertListEqual(results, list(range(1, len(results) + 1)))
+
+    def test_runner_errors(self):
+        def bad():
+            raise RuntimeError("bad")
+
+        def fail():
+            raise RuntimeError("fail")
+
+        self.parser.register_action(bad)
+        self.parser.register_function(fail)
+        errors = []
+        runner = PrecisionRunner(
+            resolve(self.parser, """bad()@[0.0005]:3""")[0],
+            error_callback=errors.append,
+        )
+        runner.run()
+        self.assertEqual(runner.stats.firings, 3)  # action errors do not stop the run
+        runner = PrecisionRunner(
+            resolve(self.parser, """foo()@[0.0005, fail()]:3""")[0],
+            error_callback=errors.append,
+        )
+        runner.run()
+        self.assertEqual(runner.stats.firings, 1)
+        self.assertEqual(runner.stats.errors, 1)
+        self.assertEqual(len(errors), 4)
+
+    def test_stream_async_interval(self):
+        async def short():
+            return 0.0005
+
+        self.parser.register_function(short)
+
+        async def main():
+            stream = resolve(self.parser, """foo()@[short()]:5""")[0].stream(
+                precise=True
+            )
+            return [x async for x in stream], stream.stats
+
+        results, stats = asyncio.run(main())
+        self.assertListEqual(results, list(range(1, 6)))
+        self.assertAlmostEqual(stats.nominal, 0.0025)
+
+    def test_stream(self):
+        async def main():
+            stream = resolve(self.parser, """foo()@[0.0005]:20""")[0].stream(
+                precise=True
+            )
+            return [x async for x in stream], stream.stats
+
+        results, stats = asyncio.run(main())
+        self.assertListEqual(results, list(range(1, 21)))
+        self.assertEqual(stats.firings, 20)
+        self.assertGreaterEqual(stats.elapsed, 0.01)
+
+    def test_stream_yields(self):
+        async def main():
+            ticks = 0
+            done = False
+
+            async def other():
+                nonlocal ticks
+                while not done:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.ensure_future(other())
+            stream = resolve(self.parser, """foo()@[0.0005]:400""")[0].stream(
+                precise=True
+            )
+            results = [x async for x in stream]
+            done = True
+            await task
+            return results, ticks
+
+        results, ticks = asyncio.run(main())
+        self.assertEqual(len(results), 400)
+        self.assertGreaterEqual(
+            ticks, 400
+        )  # the other task ran at least once per firing
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import gc
+import time
+import unittest
+import warnings
+from pyfuncschedule import ThreadedRunner, AsyncRunner
+from helpers import make_parser, resolve
+
+
+class TestPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = 0
+
+        def foo(name):
+            return name
+
+        def slow():
+            self.calls += 1
+            time.sleep(0.05)
+            return 0.1
+
+        async def aslow():
+            await asyncio.sleep(0.05)
+            return 0.1
+
+        def fail():
+            raise RuntimeError("fail")
+
+        self.parser = make_parser([foo], [slow, aslow, fail])
+
+    def test_threaded(self):
+        schedules = resolve(
+            self.parser, """foo("a")@[slow()]:4 \n foo("b")@[0.005]:60"""
+        )
+        results = []
+        with ThreadedRunner(schedules, prefetch=2, callback=results.append) as runner:
+            self.assertTrue(runner.join(timeout=5))
+        self.assertEqual(self.calls, 4)
+        self.assertEqual(results.count("a"), 4)
+        self.assertEqual(results.count("b"), 60)
+        # the slow interval function does not block the scheduler thread
+        self.assertLess(runner.stats.max_lateness, 0.04)
+
+    def test_threaded_async_interval(self):
+        errors = []
+        schedules = resolve(self.parser, """foo("a")@[aslow()]:2""")
+        with ThreadedRunner(
+            schedules, prefetch=1, error_callback=errors.append
+        ) as runner:
+            self.assertTrue(runner.join(timeout=5))
+        self.assertEqual(runner.stats.fired, 0)
+        self.assertIsInstance(errors[0], TypeError)
+
+    def test_sync_async_interval(self):
+        (schedule,) = resolve(self.parser, """foo("a")@[aslow()]:2""")
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            with self.assertRaises(TypeError):
+                next(iter(schedule))
+            gc.collect()
+        self.assertListEqual(caught, [])  # the coroutine is closed
+
+    def test_checkpoint(self):
+        schedules = resolve(self.parser, """foo("a")@[1]:* \n foo("b")@[slow()]:*""")
+        with ThreadedRunner(schedules, prefetch=3) as runner:
+            time.sleep(0.02)  # "a" has prefetched ahead, "b" is waiting
+            state = {entry["key"]: entry for entry in runner.checkpoint()}
+            runner.stop(wait=False)
+        self.assertSetEqual(set(state), {0, 1})
+        # the cursor excludes the prefetched intervals
+        self.assertEqual(state[0]["cursor"].count, 1)
+        self.assertEqual(state[1]["cursor"].count, 0)
+        self.assertIsNone(state[1]["remaining"])
+
+    def test_async(self):
+        async def main():
+            schedules = resolve(
+                self.parser, """foo("a")@[aslow()]:3 \n foo("b")@[0.005]:60"""
+            )
+            async with AsyncRunner(schedules, prefetch=2) as runner:
+                return [x async for x in runner], runner.stats
+
+        results, stats = asyncio.run(main())
+        self.assertEqual(results.count("a"), 3)
+        self.assertEqual(results.count("b"), 60)
+        self.assertLess(stats.max_lateness, 0.04)
+
+    def test_interval_error(self):
+        async def main():
+            errors = []
+            schedules = resolve(
+                self.parser, """foo("a")@[0, fail()]:3 \n foo("b")@[0.001]:2"""
+            )
+            async with AsyncRunner(
+                schedules, prefetch=1, error_callback=errors.append
+            ) as runner:
+                return [x async for x in runner], errors
+
+        results, errors = asyncio.run(main())
+        self.assertListEqual(sorted(results), ["a", "b", "b"])
+        self.assertIsInstance(errors[0], RuntimeError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import threading
+import time
+import unittest
+from pyfuncschedule import ThreadedRunner, run
+from helpers import make_parser, resolve
+
+
+class TestThreadedRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.calls = []
+
+        def foo(name):
+            with self.lock:
+                self.calls.append((name, time.monotonic()))
+            return name
+
+        self.parser = make_parser([foo])
+
+    def test_run(self):
+        start = time.monotonic()
+        stats = run(resolve(self.parser, """foo("a")@[0.01]:3 \n foo("b")@[0.015]:2"""))
+        self.assertEqual(stats.fired, 5)
+        self.assertEqual(stats.completed, 5)
+        times = {name: [] for name, _ in self.calls}
+        for name, t in self.calls:
+            times[name].append(round(t - start, 2))
+        self.assertEqual(len(times["a"]), 3)
+        self.assertEqual(len(times["b"]), 2)
+        self.assertGreaterEqual(times["a"][-1], 0.03)
+
+    def test_many_schedules(self):
+        schedules = resolve(
+            self.parser, "\n".join(f'foo("{i}")@[0.001]:2' for i in range(500))
+        )
+        before = threading.active_count()
+        with ThreadedRunner(schedules, max_workers=4) as runner:
+            self.assertLessEqual(threading.active_count() - before, 5)
+            self.assertTrue(runner.join(timeout=5))
+        self.assertEqual(runner.stats.completed, 1000)
+
+    def test_errors(self):
+        errors = []
+
+        def bar():
+            raise RuntimeError("bar")
+
+        self.parser.register_action(bar)
+        stats = run(
+            resolve(self.parser, """bar()@[0]:2"""), error_callback=errors.append
+        )
+        self.assertEqual(stats.errors, 2)
+        self.assertEqual(len(errors), 2)
+
+    def test_first_interval_error(self):
+        def bad():
+            raise RuntimeError("bad")
+
+        self.parser.register_function(bad)
+        errors = []
+        stats = run(
+            resolve(self.parser, """foo("a")@[bad()]:3 \n foo("b")@[0.01]:2"""),
+            error_callback=errors.append,
+        )
+        self.assertListEqual([name for name, _ in self.calls], ["b", "b"])
+        self.assertEqual(stats.errors, 1)
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], RuntimeError)
+
+    def test_error_callback_without_lock(self):
+        def bad():
+            raise RuntimeError("bad")
+
+        self.parser.register_function(bad)
+        schedules = resolve(
+            self.parser, """foo("a")@[0.01]:* \n foo("b")@[0.0, bad()]:1"""
+        )
+        errors, unlocked = [], []
+
+        def error_callback(error):
+            errors.append(error)
+            # the runner can be used from other threads while the callback runs
+            thread = threading.Thread(target=runner.checkpoint)
+            thread.start()
+            thread.join(timeout=1)
+            unlocked.append(not thread.is_alive())
+            runner.stop()
+
+        runner = ThreadedRunner(schedules, error_callback=error_callback)
+        runner.start()
+        self.assertTrue(runner.join(timeout=5))
+        runner._thread.join(timeout=5)
+        self.assertFalse(runner._thread.is_alive())
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(unlocked, [True])
+
+    def test_callback_on_action_thread(self):
+        threads = []
+        runner = ThreadedRunner(
+            resolve(self.parser, """foo("a")@[0]:200"""),
+            max_workers=1,
+            callback=lambda _: threads.append(threading.current_thread()),
+        )
+        with runner:
+            self.assertTrue(runner.join(timeout=5))
+        self.assertEqual(len(threads), 200)
+        self.assertNotIn(runner._thread, threads)
+
+    def test_add_and_stop(self):
+        results = []
+        runner = ThreadedRunner(callback=results.append).start()
+        runner.add(resolve(self.parser, """foo("a")@[0.005]:*""")[0])
+        time.sleep(0.05)
+        runner.stop()
+        fired = runner.stats.fired
+        self.assertGreater(fired, 0)
+        time.sleep(0.02)
+        self.assertEqual(runner.stats.fired, fired)
+
+    def test_cancel_pause(self):
+        a, b = resolve(self.parser, """foo("a")@[0.002]:* \n foo("b")@[0.002]:*""")
+        with ThreadedRunner() as runner:
+            other = runner.add(a)
+            handle = runner.add(b)
+            runner.pause(handle)
+            time.sleep(0.05)
+            self.assertNotIn("b", [name for name, _ in self.calls])
+            runner.resume(handle)
+            time.sleep(0.05)
+            self.assertIn("b", [name for name, _ in self.calls])
+            runner.cancel(handle)
+            runner.cancel(other)
+            self.assertTrue(runner.join(timeout=1))
+
+    def test_spread(self):
+        schedules = resolve(
+            self.parser, "\n".join(f'foo("{i}")@[0.2]:1' for i in range(100))
+        )
+        start = time.monotonic()
+        stats = run(schedules, spread=True)
+        self.assertEqual(stats.fired, 100)
+        offsets = sorted(t - start for _, t in self.calls)
+        self.assertLess(offsets[0], 0.05)
+        self.assertGreater(offsets[-1], 0.15)
+        # deterministic
+        self.calls.clear()
+        start = time.monotonic()
+        run(schedules, spread=True)
+        again = sorted(t - start for _, t in self.calls)
+        for a, b in zip(offsets, again):
+            self.assertAlmostEqual(a, b, delta=0.02)
+
+    def test_rate_limit(self):
+        schedules = resolve(
+            self.parser, "\n".join(f'foo("{i}")@[0.01]:2' for i in range(20))
+        )
+        start = time.monotonic()
+        stats = run(schedules, rate_limit=200, burst=5)
+        elapsed = time.monotonic() - start
+        self.assertEqual(stats.fired, 40)
+        self.assertGreater(stats.throttled, 0)
+        self.assertGreater(stats.total_throttle_delay, 0)
+        # 40 firings, 5 immediately then 200/s
+        self.assertGreaterEqual(elapsed, 35 / 200)
+
+    def test_checkpoint_restore(self):
+        schedules = resolve(self.parser, """foo("a")@[0.001,1]:*""")
+        with ThreadedRunner(schedules) as runner:
+            time.sleep(0.1)
+            state = runner.checkpoint()
+        self.assertEqual(len(state), 1)
+        self.assertEqual(state[0]["key"], 0)
+        self.assertEqual(state[0]["cursor"].count, 2)
+        self.assertGreater(state[0]["remaining"], 0.5)
+
+        runner = ThreadedRunner()
+        handle = runner.restore(state, schedules)[0]
+        self.assertEqual(handle.cursor(), state[0]["cursor"])
+        self.assertAlmostEqual(
+            handle._deadline - time.monotonic(), state[0]["remaining"], places=1
+        )
+        runner.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
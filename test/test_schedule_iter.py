@@ -1,6 +1,9 @@
+import os
+import tempfile
 import unittest
 from itertools import islice
-from pyfuncschedule import ScheduleParser
+from pyfuncschedule import ScheduleParser, ScheduleCursor, cursor
+from helpers import make_parser, resolve
 
 
 class TestActionScheduleIter(unittest.TestCase):
@@ -125,5 +128,52 @@ class TestActionScheduleIter(unittest.TestCase):
         self.assertEqual(self.state, 6)
 
 
+class TestScheduleCursor(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = make_parser([("foo", lambda: None)])
+
+    def test_resume_every_position(self):
+        schedule = resolve(self.parser, """foo()@[1,[1,[2]:2]:2,3]:2""")[0]
+        expected = [interval for interval, _ in schedule]
+        for n in range(len(expected) + 1):
+            it = iter(schedule)
+            head = [interval for interval, _ in islice(it, n)]
+            resumed = [interval for interval, _ in schedule.resume(it.cursor())]
+            self.assertListEqual(head + resumed, expected)
+
+    def test_cursor_state(self):
+        schedule = resolve(self.parser, """foo()@[1,[2]:2]:*""")[0]
+        it = iter(schedule)
+        list(islice(it, 5))
+        c = it.cursor()
+        self.assertEqual(c.count, 5)
+        self.assertEqual(c.elapsed, 8.0)
+        self.assertEqual(c.stack, ((1, 1), (0, 1)))
+        self.assertTrue(schedule.resume(c).cursor() == c)
+
+    def test_exhausted(self):
+        schedule = resolve(self.parser, """foo()@[1]:2""")[0]
+        it = iter(schedule)
+        list(it)
+        self.assertTrue(it.cursor().done)
+        self.assertListEqual(list(schedule.resume(it.cursor())), [])
+
+    def test_mismatch(self):
+        schedule = resolve(self.parser, """foo()@[1,2]:2""")[0]
+        with self.assertRaises(ValueError):
+            schedule.resume(ScheduleCursor(((0, 0), (0, 0))))
+
+    def test_save_load(self):
+        schedule = resolve(self.parser, """foo()@[1,[2]:2]:*""")[0]
+        its = [iter(schedule), iter(schedule)]
+        next(its[0])
+        state = {"cursors": [it.cursor() for it in its]}
+        with tempfile.TemporaryDirectory() as path:
+            path = os.path.join(path, "state.json")
+            cursor.save(path, state)
+            self.assertEqual(cursor.load(path), state)
+
+
 if __name__ == "__main__":
     unittest.main()
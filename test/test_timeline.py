@@ -0,0 +1,75 @@
+import unittest
+from itertools import accumulate, islice
+from pyfuncschedule import (
+    firing_times,
+    iter_firing_times,
+    firing_histogram,
+)
+from helpers import make_parser, resolve
+
+
+class TestTimeline(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = make_parser([("foo", lambda: None)], [("bar", lambda: 1.5)])
+
+    def expected(self, schedules, horizon):
+        # reference: iterate each schedule by hand and merge
+        firings = []
+        for i, schedule in enumerate(schedules):
+            for t in accumulate(interval for interval, _ in islice(schedule, 1000)):
+                if t > horizon:
+                    break
+                firings.append((t, i))
+        return sorted(firings)
+
+    def test_static(self):
+        schedules = resolve(
+            self.parser, """foo()@[1,[2]:2]:* \n foo()@[0.5]:3 \n foo()@[0.25]:*"""
+        )
+        timeline = firing_times(schedules, 20)
+        self.assertListEqual(
+            list(zip(timeline.times, timeline.index)), self.expected(schedules, 20)
+        )
+        timeline = firing_times(schedules[:1], 20)
+        self.assertListEqual(
+            list(zip(timeline.times, timeline.index)),
+            self.expected(schedules[:1], 20),
+        )
+
+    def test_dynamic(self):
+        schedules = resolve(self.parser, """foo()@[1,[2]:2]:* \n foo()@[bar()]:*""")
+        timeline = firing_times(schedules, 20)
+        self.assertListEqual(
+            list(zip(timeline.times, timeline.index)), self.expected(schedules, 20)
+        )
+        self.assertListEqual(
+            list(iter_firing_times(schedules, 20)), self.expected(schedules, 20)
+        )
+
+    def test_histogram(self):
+        schedules = resolve(
+            self.parser, """foo()@[1]:* \n foo()@[0.5]:4 \n foo()@[bar()]:*"""
+        )
+        timeline = firing_times(schedules, 10)
+        counts = firing_histogram(schedules, 10, 2.5)
+        self.assertListEqual(list(counts), list(timeline.histogram(2.5)))
+        self.assertEqual(sum(counts), len(timeline))
+        self.assertEqual(timeline.peak(2.5), (0.0, 7))
+
+    def test_infinite_at_zero(self):
+        with self.assertRaises(ValueError):
+            firing_times(resolve(self.parser, """foo()@[0]:*"""), 10)
+
+    def test_dynamic_infinite_at_zero(self):
+        self.parser.register_function(lambda: 0, "zero")
+        for source in ("""foo()@[zero()]:*""", """foo()@[1, [0]:*]"""):
+            schedules = resolve(self.parser, source)
+            with self.assertRaises(ValueError):
+                firing_times(schedules, 10)
+            with self.assertRaises(ValueError):
+                firing_histogram(schedules, 10, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
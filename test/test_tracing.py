@@ -0,0 +1,87 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pyfuncschedule import Tracer, run
+from helpers import make_parser, resolve
+
+
+class TestTracer(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = make_parser([("foo", lambda x: x)], [("bar", lambda: 0.001)])
+
+    def test_ring_buffer(self):
+        tracer = Tracer(capacity=4)
+        for i in range(10):
+            tracer.record(Tracer.CALL, i, float("nan"), float(i), float(i) + 0.5)
+        self.assertEqual(len(tracer), 4)
+        self.assertEqual(tracer.dropped, 6)
+        self.assertListEqual([e["name"] for e in tracer.events()], ["6", "7", "8", "9"])
+
+    def test_concurrent_record(self):
+        tracer = Tracer(capacity=100000)
+
+        def record():
+            for i in range(10000):
+                tracer.record(Tracer.CALL, i, float("nan"), 0.0, 0.0)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(tracer), 80000)
+        self.assertEqual(tracer.dropped, 0)
+
+    def test_threaded_runner(self):
+        tracer = Tracer()
+        run(
+            resolve(self.parser, """foo(1)@[0.001]:5 \n foo(2)@[bar()]:3"""),
+            tracer=tracer,
+        )
+        events = tracer.events()
+        self.assertEqual(len(events), 8)
+        self.assertEqual(sum(e["name"] == "foo(1)" for e in events), 5)
+        for e in events:
+            self.assertEqual(e["kind"], "firing")
+            self.assertLessEqual(e["scheduled"], e["start"])
+            self.assertLessEqual(e["start"], e["end"])
+
+    def test_install(self):
+        tracer = Tracer().install()
+        try:
+            schedule = resolve(self.parser, """foo(1)@[bar()]:3""")[0]
+            for _, action in schedule:
+                action()
+        finally:
+            tracer.uninstall()
+        names = [e["name"] for e in tracer.events()]
+        self.assertListEqual(names, ["bar()", "foo(1)"] * 3)
+        self.assertEqual(len(list(resolve(self.parser, """foo(1)@[bar()]:3""")[0])), 3)
+        self.assertEqual(len(tracer), 6)  # uninstalled
+
+    def test_chrome_trace(self):
+        async def main():
+            schedules = resolve(self.parser, """foo(1)@[0.001]:3""")
+            async with self.parser.runner(schedules, tracer=tracer) as runner:
+                return [x async for x in runner]
+
+        tracer = Tracer()
+        self.assertListEqual(asyncio.run(main()), [1, 1, 1])
+        with tempfile.TemporaryDirectory() as path:
+            path = os.path.join(path, "trace.json")
+            tracer.dump(path)
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+        events = trace["traceEvents"]
+        self.assertEqual(len(events), 3)
+        self.assertEqual(events[0]["ph"], "X")
+        self.assertEqual(events[0]["name"], "foo(1)")
+        self.assertGreaterEqual(events[0]["args"]["lateness_us"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()